@@ -1,6 +1,26 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, font, ttk
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, font, ttk
+except ImportError:  # No python3-tk: --tui and --import-library still work
+    tk = None
+from bisect import bisect_left, bisect_right
+import argparse
+import hashlib
 import math
+import os
+import queue
+import sys
+import threading
+import time
+
+LAUNCH_TIME = time.perf_counter()  # Startup is measured from here to the first frame
+
+from glance_engine import (
+    INGEST_EXTENSIONS, PACING_RULES_PATH, FrameTrace, IngestLoader, LayoutCache, Library,
+    PacingRules, ReadingEngine, ReadingLog, ReadingQueue, SearchIndex, SessionStore, StreamingLoader,
+    StreamReader, StreamRing, TokenStore,
+    format_minutes, load_font_list, save_font_list
+)
 
 # =============================================================================
 #  THEME CONFIGURATIONS
@@ -28,8 +48,195 @@ THEMES = {
     }
 }
 
+RETOKENIZE_DEBOUNCE_MS = 300  # Quiet time after the last keystroke before re-splitting
+STREAM_THRESHOLD_BYTES = 2 << 20  # Larger files load in the background
+PREVIEW_CHARS = 20000  # What the text box shows of a streamed file
+LOADER_POLL_MS = 50
+SESSION_SAVE_DEBOUNCE_MS = 1000
+SESSION_AUTOSAVE_MS = 5000
+OVERLAY_REFRESH_MS = 250
+PREWARM_WORDS = 48  # How far ahead word layouts are measured
+PREWARM_BATCH = 8  # Words measured per idle callback
+STATUS_FRAME_MS = 16  # Progress/status bar repaint at most this often (~60 Hz)
+SEARCH_INDEX_BATCH = 20000  # Words indexed per idle callback (a few ms)
+QUEUE_PREFETCH = 1  # Queued documents held tokenized in memory ahead of time
+STREAM_KEEP_WORDS = 20000  # Live stream: newest words kept (twice that at most)
+STREAM_FEED_CHARS = 1 << 16  # Stream text tokenized per poll, a few ms at most
+STARTUP_BUDGET_MS = 400  # Launch to first interactive frame; `benchmarks.py startup` checks it
+SETTINGS_SIZE = (400, 910)  # Everything fits at this size; smaller screens scroll
+
+
+# =============================================================================
+#  RENDERING
+# =============================================================================
+class WordRenderer:
+    """Two sets of left / centre / right text items for the reader canvas.
+
+    The items are created once and afterwards only have their text, fill,
+    coordinates and state updated. They share one named Font, so a family or
+    size change restyles them in place without any item being recreated.
+    Word splits and widths come from an LRU LayoutCache for that font.
+
+    Double buffered: prepare() lays the next word out in the hidden set
+    ahead of its deadline, so show_word() only swaps which set is visible.
+    Resizing, font and colour changes re-lay out both sets, so a prepared
+    word is never stale; asking for any other word lays it out on the spot.
+    """
+    def __init__(self, canvas, family, size):
+        self.canvas = canvas
+        self.font = font.Font(root=canvas, family=family, size=size, weight="bold")
+        self.layouts = LayoutCache()
+        self.layouts.set_font(family, size, self.font.measure)
+        self.fg = "#ffffff"
+        self.highlight = "#ff0000"
+        self.accent = "#0000ff"
+        self.cx, self.cy = 0, 0
+        self.shown = None  # ("word", word, orp_idx) / ("message", text) / None
+        self.prepared = None  # (word, orp_idx) waiting in the hidden set
+        self.swaps = self.misses = 0  # show_word() calls that found / didn't find their word prepared
+
+        self.tags = ("buffer0", "buffer1")
+        self.sets = [tuple(canvas.create_text(0, 0, text="", font=self.font, anchor=anchor,
+                                              tags=("text", tag), state=state)
+                           for anchor in ("e", "center", "w"))
+                     for tag, state in zip(self.tags, ("normal", "hidden"))]
+        self.front = 0  # Index of the visible set
+
+    @property
+    def back(self):
+        return self.sets[1 - self.front]
+
+    def resize(self, width, height):
+        self.cx, self.cy = width // 2, height // 2
+        self.refresh()
+
+    def set_font(self, family, size):
+        self.font.configure(family=family, size=size)
+        self.layouts.set_font(family, size, self.font.measure)  # Drops stale widths
+        self.refresh()  # Centre char width changed, re-offset the sides
+
+    def set_colors(self, fg, highlight, accent):
+        self.fg, self.highlight, self.accent = fg, highlight, accent
+        for left, _, right in self.sets:
+            self.canvas.itemconfig(left, fill=fg)
+            self.canvas.itemconfig(right, fill=fg)
+        self.refresh()
+
+    def _lay_out(self, items, word, orp_idx):
+        left, center_char, right, _, center_width, _ = self.layouts.get(word, orp_idx)
+        half = center_width / 2
+        cx, cy = self.cx, self.cy
+        left_item, center_item, right_item = items
+
+        self.canvas.itemconfig(left_item, text=left)
+        self.canvas.coords(left_item, cx - half, cy)
+        self.canvas.itemconfig(center_item, text=center_char, fill=self.highlight)
+        self.canvas.coords(center_item, cx, cy)
+        self.canvas.itemconfig(right_item, text=right)
+        self.canvas.coords(right_item, cx + half, cy)
+
+    def prepare(self, word, orp_idx):
+        """Lays word out, hidden, so that showing it is just a swap"""
+        if not word or (word, orp_idx) == self.prepared: return
+        self._lay_out(self.back, word, orp_idx)
+        self.prepared = (word, orp_idx)
+
+    def show_word(self, word, orp_idx):
+        if not word:
+            self.clear()
+            return
+        if (word, orp_idx) == self.prepared:
+            self.swaps += 1
+        else:
+            self._lay_out(self.back, word, orp_idx)
+            self.misses += 1
+        self.canvas.itemconfig(self.tags[1 - self.front], state="normal")
+        self.canvas.itemconfig(self.tags[self.front], state="hidden")
+        self.front = 1 - self.front
+        self.prepared = None  # The hidden set now holds the previous word
+        self.shown = ("word", word, orp_idx)
+
+    def show_message(self, text):
+        """Centred single-colour text, e.g. the COMPLETED screen"""
+        left, center, right = self.sets[self.front]
+        self.canvas.itemconfig(left, text="")
+        self.canvas.itemconfig(right, text="")
+        self.canvas.itemconfig(center, text=text, fill=self.accent)
+        self.canvas.coords(center, self.cx, self.cy)
+        self.shown = ("message", text)
+
+    def clear(self):
+        for item in self.sets[self.front]:
+            self.canvas.itemconfig(item, text="")
+        self.shown = None
+
+    def prepared_rate(self):
+        shown = self.swaps + self.misses
+        return self.swaps / shown if shown else 0.0
+
+    def refresh(self):
+        """Re-lay out whatever is on screen, and the prepared word"""
+        if self.prepared is not None:
+            self._lay_out(self.back, *self.prepared)
+        if self.shown is None: return
+        if self.shown[0] == "word":
+            self._lay_out(self.sets[self.front], self.shown[1], self.shown[2])
+        else:
+            self.show_message(self.shown[1])
+
+
+class StatusView:
+    """Progress bar and status line behind a dirty flag.
+
+    invalidate() only marks them stale; one flush per STATUS_FRAME_MS asks
+    `compute` for (fraction, text) and touches a widget only if the bar's
+    pixel width or the text differs from what is already on screen.
+    Time spent flushing adds up in spent_ms until take_spent() reads it.
+    """
+    def __init__(self, root, bar, rect, label, compute):
+        self.root, self.bar, self.rect, self.label = root, bar, rect, label
+        self.compute = compute
+        self.drawn_px = self.drawn_text = None
+        self.spent_ms = 0.0
+        self._job = None
+        bar.bind("<Configure>", lambda e: self.invalidate())
+
+    def invalidate(self):
+        if self._job is None:
+            self._job = self.root.after(STATUS_FRAME_MS, self.flush)
+
+    def flush(self):
+        t0 = time.perf_counter()
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        fraction, text = self.compute()
+        px = int(self.bar.winfo_width() * fraction)
+        if px != self.drawn_px:
+            self.drawn_px = px
+            self.bar.coords(self.rect, 0, 0, px, 6)
+        if text is not None:
+            self._show_text(text)
+        self.spent_ms += (time.perf_counter() - t0) * 1000
+
+    def take_spent(self):
+        """Milliseconds spent flushing since the last call"""
+        spent, self.spent_ms = self.spent_ms, 0.0
+        return spent
+
+    def set_text(self, text):
+        """Shows a one-off message now, after settling any pending update"""
+        if self._job is not None: self.flush()
+        self._show_text(text)
+
+    def _show_text(self, text):
+        if text != self.drawn_text:
+            self.drawn_text = text
+            self.label.config(text=text)
+
+
 class GlanceApp:
-    def __init__(self, root):
+    def __init__(self, root, reopen_last=True):
         self.root = root
         self.root.title("Glance")
         self.root.geometry("900x700")
@@ -41,12 +248,50 @@ class GlanceApp:
         self.font_family = "Courier New"
         self.font_size = 60
         self.settings_window = None  # Track the settings window instance
+        self._settings_theme = None  # Theme the settings window was built in
+        self._settings_controls = {}
+        self.font_families = load_font_list()  # Cached list; checked when settings first open
+        self._fonts_checked = False
         
         # --- App State ---
-        self.words = []
-        self.current_index = 0
+        self.engine = ReadingEngine()  # Document, position and pacing
+        self._rules_mtime = None
+        self._load_pacing_rules()
         self.is_running = False
         self.has_content = False
+        self._tick_job = None
+        self._retokenize_job = None
+        self.loader = None  # Active StreamingLoader, if any
+        self.source_path = None  # Set while the text box only shows a preview
+        self.stream = None  # StreamRing while reading a live stream
+        self._starved = False
+        self.sessions = SessionStore()
+        self.reading_log = ReadingLog(enabled=self.sessions.settings.get("reading_log", False))
+        self.doc_path = None  # File the current content came from
+        self.doc_digest = None  # Its content hash, once known
+        self._pending_resume = None  # Saved state waiting for enough words
+        self._session_save_job = None
+        self._restore_settings()
+        self.trace = None  # FrameTrace while frame timing is recorded
+        self.show_overlay = False
+        self._overlay_updated = 0.0
+        self._prewarm_next = 0  # Next word index whose layout to measure
+        self._prewarm_end = 0
+        self._prewarm_job = None
+        self._stage_index = 0  # Flash to lay out in the renderer's hidden item set
+        self._stage_job = None
+        self._seek_preview = None  # Fraction under the pointer while dragging the progress bar
+        self.search = SearchIndex()  # Built in idle slices as text arrives
+        self._index_job = None
+        self._hits = None
+        self._hits_key = None  # (query, index generation, words indexed) the hits are for
+        # Next documents, the head tokenized in the background while this one plays
+        self.library = Library()  # Imported folders, already in the token cache
+        self._library_import = None  # (thread, messages, cancel event) while importing
+        self.queue = ReadingQueue(prefetch=QUEUE_PREFETCH, digest_for=self._digest_for, rules=self.engine.rules)
+        self._queue_job = None
+        self.auto_advance = self.sessions.settings.get("auto_advance", True)
+        self._auto_start = False  # Queued document to start once its loader has found its place
 
         # --- Build UI ---
         # We keep references to frames so we can update their colors later
@@ -57,19 +302,63 @@ class GlanceApp:
         self._build_header()
         self._build_display_area()
         self._build_controls()
+        self.wpm_var.trace_add("write", self._sync_wpm)
         self._build_input_area()
         self._build_status_bar()
 
         # Apply initial theme
         self.apply_theme(self.current_theme_name)
+        if self.sessions.settings.get("wpm"):
+            self.wpm_var.set(self.sessions.settings["wpm"])
 
         # --- Bindings ---
         self.root.bind('<space>', lambda e: self.toggle_reading())
         self.root.bind('<Left>', lambda e: self.scrub_backward())
         self.root.bind('<Right>', lambda e: self.scrub_forward())
+        self.root.bind('<Control-Left>', lambda e: self.seek_sentence(-1))
+        self.root.bind('<Control-Right>', lambda e: self.seek_sentence(1))
+        self.root.bind('<Control-Up>', lambda e: self.seek_paragraph(-1))
+        self.root.bind('<Control-Down>', lambda e: self.seek_paragraph(1))
+        self.root.bind('<Escape>', lambda e: self.cancel_loading())
+        self.root.bind('<F3>', lambda e: self.set_overlay(not self.show_overlay))
+        self.root.bind('<Control-f>', lambda e: self.focus_search())
         
         # Auto-update word count/eta when typing in text box
-        self.text_input.bind('<KeyRelease>', lambda e: self.prepare_words())
+        for sequence in ('<KeyRelease>', '<<Paste>>', '<<Cut>>'):
+            self.text_input.bind(sequence, lambda e: self._schedule_retokenize())
+
+        # --- Saved Progress ---
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(SESSION_AUTOSAVE_MS, self._autosave)
+
+        # --- Startup ---
+        self.startup_ms = None
+        self.root.after_idle(self._first_frame)  # Queued first, so reopening a book isn't counted
+        if reopen_last:
+            self.root.after_idle(self._reopen_last_document)
+
+    # --- The engine owns the document and the reading position ---
+    @property
+    def store(self):
+        return self.engine.store
+
+    @store.setter
+    def store(self, store):
+        self.engine.store = store
+
+    @property
+    def current_index(self):
+        return self.engine.index
+
+    @current_index.setter
+    def current_index(self, index):
+        self.engine.index = index
+
+    def _sync_wpm(self, *_):
+        try:
+            self.engine.wpm = self.wpm_var.get()
+        except tk.TclError:
+            pass  # Mid-edit value, keep the last good one
 
     # =========================================================================
     #  UI BUILDERS
@@ -105,6 +394,8 @@ class GlanceApp:
         self.canvas = tk.Canvas(self.frames['display'], highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.canvas.bind("<Configure>", self._draw_guides)
+        self.renderer = WordRenderer(self.canvas, self.font_family, self.font_size)
+        self.overlay_item = self.canvas.create_text(10, 10, text="", anchor="nw", font=("Consolas", 9), tags="overlay")
 
     def _build_controls(self):
         self.frames['controls'] = tk.Frame(self.root, pady=15)
@@ -138,7 +429,7 @@ class GlanceApp:
         self.wpm_var = tk.IntVar(value=350)
         self.wpm_scale = tk.Scale(
             wpm_container, 
-            from_=100, to=1000, 
+            from_=100, to=2500, 
             orient=tk.HORIZONTAL, 
             variable=self.wpm_var,
             highlightthickness=0,
@@ -164,6 +455,10 @@ class GlanceApp:
         self.progress_canvas = tk.Canvas(self.frames['progress'], height=6, highlightthickness=0)
         self.progress_canvas.pack(fill=tk.X)
         self.progress_rect = self.progress_canvas.create_rectangle(0, 0, 0, 6, width=0)
+        self.progress_canvas.configure(cursor="hand2")
+        self.progress_canvas.bind("<Button-1>", self._on_progress_drag)
+        self.progress_canvas.bind("<B1-Motion>", self._on_progress_drag)
+        self.progress_canvas.bind("<ButtonRelease-1>", self._on_progress_release)
 
     def _build_input_area(self):
         self.frames['input'] = tk.Frame(self.root, pady=20)
@@ -186,6 +481,43 @@ class GlanceApp:
         )
         self.btn_load.pack(side=tk.RIGHT)
 
+        self.btn_queue = tk.Button(
+            header,
+            text="＋ Queue",
+            command=self.queue_files,
+            relief=tk.FLAT,
+            font=("Segoe UI", 9)
+        )
+        self.btn_queue.pack(side=tk.RIGHT, padx=(5, 0))
+
+        self.btn_clear = tk.Button(
+            header,
+            text="✕ Clear",
+            command=self.clear_content,
+            relief=tk.FLAT,
+            font=("Segoe UI", 9)
+        )
+        self.btn_clear.pack(side=tk.RIGHT, padx=5)
+
+        # Search: Enter / Shift+Enter step through the matches
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(header, textvariable=self.search_var, width=24,
+                                     relief=tk.FLAT, font=("Segoe UI", 9))
+        self.search_entry.pack(side=tk.LEFT, padx=(15, 5))
+        # Typing here must not trigger the window's reading shortcuts (space, arrows)
+        self.search_entry.bindtags((self.search_entry, "Entry", "all"))
+        self.search_entry.bind("<Return>", lambda e: self.find_next(1))
+        self.search_entry.bind("<Shift-Return>", lambda e: self.find_next(-1))
+        self.search_entry.bind("<Escape>", lambda e: self.root.focus_set())
+        self.btn_find_prev = tk.Button(header, text="◀", command=lambda: self.find_next(-1),
+                                       relief=tk.FLAT, font=("Segoe UI", 9))
+        self.btn_find_prev.pack(side=tk.LEFT)
+        self.btn_find_next = tk.Button(header, text="▶", command=lambda: self.find_next(1),
+                                       relief=tk.FLAT, font=("Segoe UI", 9))
+        self.btn_find_next.pack(side=tk.LEFT, padx=(2, 0))
+        self.labels['search_hits'] = tk.Label(header, text="", font=("Segoe UI", 9))
+        self.labels['search_hits'].pack(side=tk.LEFT, padx=5)
+
         # Text Box
         self.text_input = tk.Text(
             self.frames['input'], 
@@ -209,24 +541,81 @@ class GlanceApp:
             font=("Segoe UI", 9)
         )
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status = StatusView(self.root, self.progress_canvas, self.progress_rect,
+                                 self.status_bar, self._progress_fields)
 
     # =========================================================================
     #  SETTINGS & THEMING
     # =========================================================================
 
     def open_settings(self):
-        # Check if settings window already exists and is open
-        if self.settings_window is not None and self.settings_window.winfo_exists():
-            self.settings_window.lift()
-            return
-
+        # Built once and then only hidden/shown; rebuilt if the theme changed meanwhile
+        sw = self.settings_window
+        if sw is not None and self._settings_theme != self.current_theme_name:
+            sw.destroy()
+            sw = None
+        if sw is None:
+            self._build_settings()
+        else:
+            self._sync_settings()
+            sw.deiconify()
+        self.settings_window.lift()
+        if not self._fonts_checked:
+            # Enumerating fonts can take a while, so never at launch or mid-reading
+            self.root.after_idle(self._refresh_font_list)
+
+    def _sync_settings(self):
+        """Brings a hidden settings window up to date before it is shown again"""
+        controls = self._settings_controls
+        controls["theme"].set(self.current_theme_name)
+        self.font_combo.set(self.font_family)
+        # Scale.set fires the command, so only move the ones that are stale
+        if controls["size"].get() != self.font_size:
+            controls["size"].set(self.font_size)
+        if controls["chunk"].get() != self.engine.chunk_size:
+            controls["chunk"].set(self.engine.chunk_size)
+        controls["trace"].set(self.trace is not None)
+        controls["overlay"].set(self.show_overlay)
+        controls["auto_advance"].set(self.auto_advance)
+        controls["reading_log"].set(self.reading_log.enabled)
+        controls["library"].config(text=self._library_summary())
+        controls["queue"].config(text=self._queue_summary())
+
+    def _build_settings(self):
         # Create a popup window (Toplevel)
-        sw = tk.Toplevel(self.root)
-        self.settings_window = sw  # Store reference
-        sw.title("Settings")
-        sw.geometry("400x450") # Made taller for font size
-        sw.resizable(False, False)
-        sw.configure(bg=self.colors["bg_panel"])
+        win = tk.Toplevel(self.root)
+        self.settings_window = win  # Store reference
+        self._settings_theme = self.current_theme_name
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)  # Hide, don't destroy
+        win.title("Settings")
+        width, height = SETTINGS_SIZE
+        win.geometry(f"{width}x{min(height, win.winfo_screenheight() - 80)}")  # Room for a taskbar
+        win.minsize(width, 200)
+        win.resizable(False, True)
+        win.configure(bg=self.colors["bg_panel"])
+
+        # Done stays at the bottom; the sections above scroll when the screen is short
+        tk.Button(win, text="Done", command=win.withdraw, bg=self.colors["accent"], fg="white",
+                  relief=tk.FLAT).pack(side=tk.BOTTOM, pady=10)
+        scroll = tk.Scrollbar(win, orient=tk.VERTICAL)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        view = tk.Canvas(win, bg=self.colors["bg_panel"], highlightthickness=0, yscrollcommand=scroll.set)
+        view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.config(command=view.yview)
+        sw = tk.Frame(view, bg=self.colors["bg_panel"])
+        body = view.create_window(0, 0, window=sw, anchor="nw")
+        sw.bind("<Configure>", lambda e: view.configure(scrollregion=view.bbox("all")))
+        view.bind("<Configure>", lambda e: view.itemconfigure(body, width=e.width))
+
+        def on_wheel(event):
+            if view.yview() == (0.0, 1.0): return  # All of it fits
+            if event.num in (4, 5):  # X11 reports the wheel as buttons
+                view.yview_scroll(-1 if event.num == 4 else 1, "units")
+            else:
+                view.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            win.bind(sequence, on_wheel)
 
         # Title
         tk.Label(sw, text="Appearance", font=("Segoe UI", 12, "bold"), 
@@ -239,8 +628,10 @@ class GlanceApp:
         
         def on_theme_change():
             self.apply_theme(theme_var.get())
+            self._schedule_session_save()
             # Refresh popup colors instantly too
-            sw.configure(bg=self.colors["bg_panel"])
+            for widget in (win, view, sw):
+                widget.configure(bg=self.colors["bg_panel"])
 
         modes_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
         modes_frame.pack(anchor="w", padx=20, pady=5)
@@ -263,21 +654,16 @@ class GlanceApp:
         font_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
         font_frame.pack(fill=tk.X, padx=20)
 
-        # Get list of fonts
-        available_fonts = sorted(font.families())
-        
-        self.font_combo = ttk.Combobox(font_frame, values=available_fonts, state="readonly")
+        # Cached across sessions; enumerating fonts can take a while
+        self.font_combo = ttk.Combobox(font_frame, values=self._font_families(), state="readonly")
         self.font_combo.set(self.font_family)
         self.font_combo.pack(fill=tk.X)
         
         def on_font_change(event):
             self.font_family = self.font_combo.get()
-            # Redraw if paused to show preview
-            if self.words and not self.is_running and self.current_index < len(self.words):
-                self.draw_word_on_canvas(self.words[self.current_index])
-            # Also redraw completed text if visible
-            elif self.words and not self.is_running and self.current_index >= len(self.words):
-                 self._draw_guides()
+            # Restyles the word or "COMPLETED" text in place
+            self.set_reader_font()
+            self._schedule_session_save()
 
         self.font_combo.bind("<<ComboboxSelected>>", on_font_change)
 
@@ -296,17 +682,146 @@ class GlanceApp:
         
         def on_size_change(val):
             self.font_size = int(val)
-            # Redraw immediately to see changes
-            if self.words and not self.is_running:
-                 if self.current_index < len(self.words):
-                     self.draw_word_on_canvas(self.words[self.current_index])
-                 else:
-                     self._draw_guides() # Redraws "COMPLETED" with new size
+            self.set_reader_font()
+            self._schedule_session_save()
 
         size_scale.config(command=on_size_change)
 
-        # Close Button
-        tk.Button(sw, text="Done", command=sw.destroy, bg=self.colors["accent"], fg="white", relief=tk.FLAT).pack(pady=30)
+        # --- Chunking ---
+        tk.Label(sw, text="Words per Flash", font=("Segoe UI", 12, "bold"),
+                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"]).pack(anchor="w", padx=20, pady=(20, 10))
+
+        chunk_scale = tk.Scale(
+            sw, from_=1, to=4, orient=tk.HORIZONTAL,
+            bg=self.colors["bg_panel"], fg=self.colors["fg_main"],
+            highlightthickness=0, troughcolor=self.colors["bg_main"],
+            activebackground=self.colors["accent"]
+        )
+        chunk_scale.set(self.engine.chunk_size)
+        chunk_scale.pack(fill=tk.X, padx=20)
+
+        def on_chunk_change(val):
+            self.set_chunk_size(int(val))
+            self._schedule_session_save()
+
+        chunk_scale.config(command=on_chunk_change)
+
+        # --- Diagnostics ---
+        tk.Label(sw, text="Diagnostics", font=("Segoe UI", 12, "bold"),
+                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"]).pack(anchor="w", padx=20, pady=(20, 10))
+
+        diag_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
+        diag_frame.pack(fill=tk.X, padx=20)
+        trace_var = tk.BooleanVar(value=self.trace is not None)
+        overlay_var = tk.BooleanVar(value=self.show_overlay)
+
+        def on_trace_toggle():
+            self.set_tracing(trace_var.get())
+            overlay_var.set(self.show_overlay)
+
+        def on_overlay_toggle():
+            self.set_overlay(overlay_var.get())
+            trace_var.set(self.trace is not None)
+
+        for text, var, command in (("Record frame timing", trace_var, on_trace_toggle),
+                                   ("Timing overlay (F3)", overlay_var, on_overlay_toggle)):
+            tk.Checkbutton(
+                diag_frame, text=text, variable=var, command=command,
+                bg=self.colors["bg_panel"], fg=self.colors["fg_main"],
+                selectcolor=self.colors["bg_panel"],
+                activebackground=self.colors["bg_panel"],
+                activeforeground=self.colors["fg_main"]
+            ).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Button(diag_frame, text="Export Trace...", command=self.export_trace,
+                  relief=tk.FLAT).pack(side=tk.RIGHT)
+
+        # --- Reading Queue ---
+        tk.Label(sw, text="Reading Queue", font=("Segoe UI", 12, "bold"),
+                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"]).pack(anchor="w", padx=20, pady=(20, 10))
+
+        queue_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
+        queue_frame.pack(fill=tk.X, padx=20)
+        advance_var = tk.BooleanVar(value=self.auto_advance)
+
+        def on_advance_toggle():
+            self.auto_advance = advance_var.get()
+            self._schedule_session_save()
+
+        tk.Checkbutton(
+            queue_frame, text="Start the next document automatically",
+            variable=advance_var, command=on_advance_toggle,
+            bg=self.colors["bg_panel"], fg=self.colors["fg_main"],
+            selectcolor=self.colors["bg_panel"],
+            activebackground=self.colors["bg_panel"],
+            activeforeground=self.colors["fg_main"]
+        ).pack(anchor="w")
+        queue_label = tk.Label(queue_frame, text=self._queue_summary(),
+                               bg=self.colors["bg_panel"], fg=self.colors["fg_main"])
+        queue_label.pack(side=tk.LEFT, pady=(5, 0))
+
+        def on_clear_queue():
+            self.clear_queue()
+            queue_label.config(text=self._queue_summary())
+
+        tk.Button(queue_frame, text="Clear Queue", command=on_clear_queue,
+                  relief=tk.FLAT).pack(side=tk.RIGHT, pady=(5, 0))
+
+        # --- Library ---
+        tk.Label(sw, text="Library", font=("Segoe UI", 12, "bold"),
+                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"]).pack(anchor="w", padx=20, pady=(20, 10))
+
+        library_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
+        library_frame.pack(fill=tk.X, padx=20)
+        library_label = tk.Label(library_frame, text=self._library_summary(),
+                                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"])
+        library_label.pack(side=tk.LEFT)
+        tk.Button(library_frame, text="Import Folder...", command=self.import_library,
+                  relief=tk.FLAT).pack(side=tk.RIGHT)
+
+        # --- Reading Log ---
+        tk.Label(sw, text="Reading Log", font=("Segoe UI", 12, "bold"),
+                 bg=self.colors["bg_panel"], fg=self.colors["fg_main"]).pack(anchor="w", padx=20, pady=(20, 10))
+
+        log_frame = tk.Frame(sw, bg=self.colors["bg_panel"])
+        log_frame.pack(fill=tk.X, padx=20)
+        log_var = tk.BooleanVar(value=self.reading_log.enabled)
+
+        def on_log_toggle():
+            self.reading_log.enabled = log_var.get()
+            self._schedule_session_save()
+
+        tk.Checkbutton(
+            log_frame, text="Keep a reading log", variable=log_var, command=on_log_toggle,
+            bg=self.colors["bg_panel"], fg=self.colors["fg_main"],
+            selectcolor=self.colors["bg_panel"],
+            activebackground=self.colors["bg_panel"],
+            activeforeground=self.colors["fg_main"]
+        ).pack(side=tk.LEFT)
+        tk.Button(log_frame, text="Export...", command=self.export_reading_log,
+                  relief=tk.FLAT).pack(side=tk.RIGHT)
+        tk.Button(log_frame, text="Stats", command=self.show_reading_stats,
+                  relief=tk.FLAT).pack(side=tk.RIGHT, padx=5)
+
+        tk.Frame(sw, height=20, bg=self.colors["bg_panel"]).pack()  # Bottom margin
+        self._settings_controls = {"theme": theme_var, "size": size_scale, "chunk": chunk_scale,
+                                   "trace": trace_var, "overlay": overlay_var,
+                                   "auto_advance": advance_var, "queue": queue_label,
+                                   "reading_log": log_var, "library": library_label}
+
+    def _font_families(self):
+        if self.font_families is None:
+            self._refresh_font_list()  # No cache yet: the first settings window needs them now
+        return self.font_families
+
+    def _refresh_font_list(self):
+        """Re-enumerates installed fonts and updates the cache if they changed"""
+        self._fonts_checked = True
+        families = sorted(set(font.families()))
+        if families != self.font_families:
+            self.font_families = families
+            save_font_list(families)
+            if self.settings_window is not None:
+                self.font_combo.configure(values=families)
 
     def apply_theme(self, theme_name):
         if theme_name == "System":
@@ -339,18 +854,24 @@ class GlanceApp:
 
         # Apply to Canvases
         self.canvas.configure(bg=c["bg_main"])
+        self.renderer.set_colors(c["fg_main"], c["highlight"], c["accent"])
         self._draw_guides() 
         self.progress_canvas.configure(bg=c["guide_lines"])
         self.progress_canvas.itemconfig(self.progress_rect, fill=c["accent"])
+        self.canvas.itemconfig(self.overlay_item, fill=c["fg_main"])
 
         # Apply to Text Inputs
         self.text_input.configure(bg=c["input_bg"], fg=c["input_fg"], insertbackground=c["fg_main"])
+        self.search_entry.configure(bg=c["input_bg"], fg=c["input_fg"], insertbackground=c["fg_main"])
 
         # Apply to Buttons
         self.btn_settings.configure(bg=c["bg_panel"], fg=c["fg_main"], activebackground=c["bg_main"])
         self.btn_toggle.configure(bg=c["accent"], fg="white")
         self.btn_reset.configure(bg="#666" if theme_name == "Dark" else "#ccc", fg="white" if theme_name == "Dark" else "black")
         self.btn_load.configure(bg="#444" if theme_name == "Dark" else "#ddd", fg="white" if theme_name == "Dark" else "black")
+        self.btn_clear.configure(bg="#444" if theme_name == "Dark" else "#ddd", fg="white" if theme_name == "Dark" else "black")
+        for btn in (self.btn_queue, self.btn_find_prev, self.btn_find_next):
+            btn.configure(bg="#444" if theme_name == "Dark" else "#ddd", fg="white" if theme_name == "Dark" else "black")
         
         # Apply to Scales
         self.wpm_scale.configure(bg=c["bg_panel"], fg=c["fg_main"], troughcolor=c["bg_main"], activebackground=c["accent"])
@@ -358,16 +879,13 @@ class GlanceApp:
         # Apply to Status Bar
         self.status_bar.configure(bg="#111" if theme_name=="Dark" else "#ddd", fg="#888" if theme_name=="Dark" else "#333")
 
-        # Redraw current word
-        if self.words and self.current_index < len(self.words):
-            self.draw_word_on_canvas(self.words[self.current_index])
 
     # =========================================================================
     #  LOGIC (Standard ProFlow Logic)
     # =========================================================================
 
     def _draw_guides(self, event=None):
-        """Draws guides AND handles recentering text on resize"""
+        """Draws guides AND recenters the reader text on resize"""
         self.canvas.delete("guides")
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
@@ -377,34 +895,598 @@ class GlanceApp:
         # Crosshair notches
         self.canvas.create_line(cx, cy - 60, cx, cy - 80, fill=col, width=2, tags="guides")
         self.canvas.create_line(cx, cy + 60, cx, cy + 80, fill=col, width=2, tags="guides")
+        self.canvas.tag_lower("guides")
 
-        # FIX: Redraw text if visible so it stays centered when resizing
-        if not self.is_running:
-            if self.words and self.current_index < len(self.words):
-                 self.draw_word_on_canvas(self.words[self.current_index])
-            elif self.current_index >= len(self.words) and self.words:
-                 # Re-center "COMPLETED" text and use current font size
-                 self.canvas.delete("text")
-                 self.canvas.create_text(
-                    cx, cy, 
-                    text="COMPLETED", 
-                    fill=self.colors["accent"], 
-                    font=(self.font_family, self.font_size, "bold"),
-                    tags="text"
-                )
+        # Keep the word (or "COMPLETED") centered when resizing
+        self.renderer.resize(w, h)
+        self._fit_chunks()
 
     def load_text_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=[
+            ("Readable Files", "*.txt *.epub *.pdf"),
+            ("Text Files", "*.txt"),
+            ("eBooks", "*.epub"),
+            ("PDF Documents", "*.pdf"),
+            ("All Files", "*.*")
+        ])
         if file_path:
+            self.open_document(file_path)
+
+    def open_document(self, file_path):
+        """Opens a file (in the background if it's big or a book); False if it can't be read"""
+        self._save_session()  # Keep the place in the outgoing document
+        try:
+            digest = self._digest_for(file_path)
+            if file_path.lower().endswith(INGEST_EXTENSIONS):
+                self._start_loader(IngestLoader(file_path, digest), digest)
+                return True
+            if os.path.getsize(file_path) > STREAM_THRESHOLD_BYTES or self.library.digest_for(file_path):
+                # Big, or imported and so already tokenized in the cache
+                self._start_loader(StreamingLoader(file_path, digest), digest)
+                return True
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+                content = raw.decode('utf-8')
+                self.reset_reader()
+                self._set_source(None)
+                self.text_input.delete("1.0", tk.END)
+                self.text_input.insert("1.0", content)
+                self.prepare_words() # Trigger update immediately
+                self.status.set_text("File loaded successfully")
+            self.doc_path = file_path
+            self.doc_digest = hashlib.sha256(raw).hexdigest()
+            self.sessions.remember_file(file_path, self.doc_digest)
+            self._pending_resume = self.sessions.document(self.doc_digest)
+            self._try_resume(final=True)
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read file:\n{e}")
+            return False
+
+    def _set_source(self, path, preview=""):
+        """Switches the text box between editable content and a file preview"""
+        self.cancel_loading()
+        self.source_path = path
+        self.stream = None
+        self.text_input.configure(state=tk.NORMAL)
+        if path is not None:
+            self.text_input.delete("1.0", tk.END)
+            self.text_input.insert("1.0", preview)
+            self.text_input.configure(state=tk.DISABLED)
+
+    def _start_loader(self, loader, digest=None):
+        """Big files and books: tokenize in the background, show a preview"""
+        self.reset_reader()
+        self.doc_path = loader.path
+        self.doc_digest = digest
+        self._pending_resume = self.sessions.document(digest)
+        name = os.path.basename(loader.path)
+        self._set_source(loader.path, f"[... loading {name} ...]")
+
+        self.store = TokenStore()
+        self.has_content = False
+        self.loader = loader
+        self.loader.start()
+        self._poll_loader()
+
+    def _show_preview(self):
+        name = os.path.basename(self.source_path)
+        self.text_input.configure(state=tk.NORMAL)
+        self.text_input.delete("1.0", tk.END)
+        size = 0
+        for chunk in self.store.chunks:
+            part = chunk[:PREVIEW_CHARS - size]
+            self.text_input.insert(tk.END, part)
+            size += len(part)
+            if size >= PREVIEW_CHARS: break
+        self.text_input.insert(tk.END, f"\n\n[... preview of {name} - press ✕ Clear to type your own text ...]")
+        self.text_input.configure(state=tk.DISABLED)
+
+    def _poll_loader(self):
+        loader = self.loader
+        if loader is None: return
+        deadline = time.perf_counter() + 0.010  # Never hog the Tk thread
+        progress = None
+        state = None
+        try:
+            while time.perf_counter() < deadline:
+                kind, payload, progress = loader.queue.get_nowait()
+                if kind == "chunk":
+                    first = not self.store
+                    self.store.append(payload)
+                    self.has_content = len(self.store) > 0
+                    if first: self._show_preview()
+                    self._try_resume()
+                    self._schedule_indexing()
+                else:
+                    state = (kind, payload)
+                    break
+        except queue.Empty:
+            if not loader.is_alive() and loader.queue.empty():
+                state = ("error", "The loader stopped unexpectedly")
+
+        if state is None:
+            self._start_when_loaded()
+            if not self.is_running and progress is not None:
+                pct = 100 * progress
+                name = os.path.basename(loader.path)
+                self.status.set_text(
+                    f"Loading {name}... {pct:.0f}% | {len(self.store)} words (Esc to cancel)")
+            self.root.after(LOADER_POLL_MS, self._poll_loader)
+            return
+
+        self.loader = None
+        if state[0] == "error":
+            self._auto_start = False
+            messagebox.showerror("Error", f"Could not read file:\n{state[1]}")
+            return
+        if self.doc_digest is None and state[1]:
+            # First open: now that the hash is known, look for saved progress
+            self.doc_digest = state[1]
+            if not self.is_running and self.current_index == 0:
+                self._pending_resume = self.sessions.document(state[1])
+        if self.doc_digest:
+            self.sessions.remember_file(loader.path, self.doc_digest)
+        self._try_resume(final=True)
+        self._start_when_loaded()
+        if not self.is_running:
+            self.update_status_with_eta()
+
+    def cancel_loading(self):
+        self._auto_start = False
+        if self.loader is None: return
+        self.loader.cancel()
+        self.loader = None
+        if not self.is_running:
+            self.status.set_text(f"Load cancelled | {len(self.store)} words loaded")
+
+    def clear_content(self):
+        self._save_session()
+        self._set_source(None)
+        self.doc_path = self.doc_digest = self._pending_resume = None
+        self.reset_reader()
+        self.text_input.delete("1.0", tk.END)
+        self.store = TokenStore()
+        self.has_content = False
+        self.update_status_with_eta()
+
+    # =========================================================================
+    #  SEARCH
+    # =========================================================================
+    def _schedule_indexing(self):
+        if self._index_job is None and self.search.pending(self.store):
+            self._index_job = self.root.after_idle(self._index_step)
+
+    def _index_step(self):
+        # A slice per idle callback keeps a big book from ever freezing the UI
+        self._index_job = None
+        self.search.extend(self.store, SEARCH_INDEX_BATCH)
+        self.engine.factors  # Pace new words now rather than on the first tick
+        self._schedule_indexing()
+
+    def focus_search(self):
+        self.search_entry.focus_set()
+        self.search_entry.select_range(0, tk.END)
+
+    def find_next(self, direction=1):
+        """Jumps to the next (or previous) match after the current word"""
+        query = self.search_var.get().strip()
+        if not query or not self.store: return
+        self.search.extend(self.store)  # Finish now if the idle slices haven't yet
+        key = (query, self.search.generation, self.search.count)
+        fresh = key != self._hits_key
+        if fresh:
+            self._hits, self._hits_key = self.search.find(query), key
+        hits = self._hits
+        if not hits:
+            self.labels['search_hits'].config(text="No matches")
+            return
+        # A new query may match right here; stepping moves on, wrapping around
+        if direction > 0:
+            i = (bisect_left if fresh else bisect_right)(hits, self.current_index)
+            if i == len(hits): i = 0
+        else:
+            i = bisect_left(hits, self.current_index) - 1
+            if i < 0: i = len(hits) - 1
+        self._jump(self.engine.seek, hits[i])
+        self.labels['search_hits'].config(text=f"{i + 1}/{len(hits)}")
+
+    # =========================================================================
+    #  READING QUEUE
+    # =========================================================================
+    def queue_files(self):
+        paths = filedialog.askopenfilenames(filetypes=[
+            ("Readable Files", "*.txt *.epub *.pdf"),
+            ("All Files", "*.*")
+        ])
+        for path in paths:
+            self.queue.add(path)
+        if not paths: return
+        if not self.has_content and self.loader is None:
+            self._advance_queue()  # Nothing open yet: the first one is up now
+        else:
+            self._poll_queue()
+            if not self.is_running:
+                self.status.set_text(self._queue_summary())
+
+    def clear_queue(self):
+        self.queue.clear()
+        self._poll_queue()
+        if not self.is_running:
+            self.status.set_text("Reading queue cleared")
+
+    def _queue_summary(self):
+        if not self.queue: return "Queue is empty"
+        head = next(iter(self.queue))
+        state = {"ready": "ready", "loading": "loading", "error": "failed"}.get(self.queue.status(head), "waiting")
+        return f"{len(self.queue)} queued | Next: {os.path.basename(head)} ({state})"
+
+    def _poll_queue(self):
+        if self._queue_job is not None:
+            self.root.after_cancel(self._queue_job)
+            self._queue_job = None
+        self.queue.rules = self.engine.rules  # Prefetches are paced for this reader
+        if self.queue.poll():
+            self._queue_job = self.root.after(LOADER_POLL_MS, self._poll_queue)
+
+    def _advance_queue(self):
+        """Switches to the next queued document, prefetched if it is ready.
+
+        Entries that can't be opened are skipped; False if none could be.
+        """
+        self._save_session()  # Keep the place in the finished document
+        while self.queue:
+            path, store, digest, paced = self.queue.pop()
+            if store:
+                self._adopt_document(path, store, digest, paced)
+                break
+            # Not prefetched yet (or it failed): load it the usual way
+            if self.open_document(path): break
+        else:
+            self._poll_queue()
+            return False  # The finished document stays current, without restarting it
+        self._poll_queue()  # Start prefetching the one after
+        if self.auto_advance and self.loader is not None:
+            self._auto_start = True  # Still loading: _poll_loader starts it
+            self._start_when_loaded()
+        elif self.auto_advance and self.has_content:
+            self.toggle_reading()
+        elif self.loader is None:
+            self.status.set_text(f"Up next: {os.path.basename(path)} | press Space to start")
+        return True
+
+    def _start_when_loaded(self):
+        """Starts an auto-advanced document once its saved place is loaded"""
+        if not self._auto_start or self.is_running: return
+        if self.has_content and self._pending_resume is None:
+            self._auto_start = False
+            self.toggle_reading()
+
+    def _adopt_document(self, path, store, digest, paced=None):
+        """Makes an already tokenized (and paced) document current, with no load step"""
+        self.reset_reader()
+        self._set_source(path)
+        self.doc_path, self.doc_digest = path, digest
+        self.store = store
+        if paced is not None:
+            self.engine.take_pacing(paced)
+        self.has_content = True
+        self._show_preview()
+        if digest:
+            self.sessions.remember_file(path, digest)
+        self._pending_resume = self.sessions.document(digest)
+        self._try_resume(final=True)
+        self._schedule_indexing()
+        self.update_status_with_eta()
+
+    # =========================================================================
+    #  LIBRARY
+    # =========================================================================
+    def _digest_for(self, path):
+        """Known content hash of an unchanged file: opened before, or imported"""
+        return self.sessions.digest_for(path) or self.library.digest_for(path)
+
+    def _library_summary(self):
+        if not len(self.library): return "No folders imported"
+        count, words, minutes = self.library.summary(self.engine.wpm)
+        return f"{count} documents | {words:,} words | {format_minutes(minutes)}"
+
+    def import_library(self):
+        """Tokenizes a whole folder into the cache on all cores, in the background"""
+        if self._library_import is not None: return
+        folder = filedialog.askdirectory(title="Import a folder into the library")
+        if not folder: return
+        messages = queue.Queue()
+        cancel = threading.Event()
+
+        def run():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.text_input.delete("1.0", tk.END)
-                    self.text_input.insert("1.0", content)
-                    self.prepare_words() # Trigger update immediately
-                    self.status_bar.config(text="File loaded successfully")
+                result = self.library.import_folder(
+                    folder, progress=lambda done, total: messages.put(("progress", done, total)),
+                    cancelled=cancel)
+                messages.put(("done", result, None))
             except Exception as e:
-                messagebox.showerror("Error", f"Could not read file:\n{e}")
+                messages.put(("error", f"{type(e).__name__}: {e}", None))
+
+        thread = threading.Thread(target=run, daemon=True)
+        self._library_import = (thread, messages, cancel)
+        thread.start()
+        self.status.set_text(f"Importing {os.path.basename(folder)}...")
+        self._poll_library_import()
+
+    def _poll_library_import(self):
+        _, messages, _ = self._library_import
+        state = None
+        try:
+            while True:
+                kind, payload, total = messages.get_nowait()
+                if kind == "progress":
+                    if not self.is_running:
+                        self.status.set_text(f"Importing library... {payload}/{total} files")
+                else:
+                    state = (kind, payload)
+        except queue.Empty:
+            pass
+        if state is None:
+            self.root.after(LOADER_POLL_MS, self._poll_library_import)
+            return
+
+        self._library_import = None
+        if state[0] == "error":
+            messagebox.showerror("Error", f"Could not import the folder:\n{state[1]}")
+            return
+        result = state[1]
+        self.status.set_text(f"Library: {result['imported']} imported, {result['unchanged']} unchanged, "
+                             f"{len(result['errors'])} failed | {self._library_summary()}")
+        if self.settings_window is not None:
+            self._settings_controls["library"].config(text=self._library_summary())
+        if result["errors"]:
+            shown = "\n".join(f"{os.path.basename(p)}: {msg}" for p, msg in result["errors"][:10])
+            more = len(result["errors"]) - 10
+            messagebox.showwarning("Library Import", f"Some files could not be imported:\n\n{shown}"
+                                   + (f"\n... and {more} more" if more > 0 else ""))
+
+    # =========================================================================
+    #  LIVE STREAM
+    # =========================================================================
+    def open_stream(self, path=None):
+        """Reads text as it is produced: stdin (path None or "-") or a growing file"""
+        self._save_session()
+        reader = StreamReader(path)
+        self.reset_reader()
+        self.doc_path = self.doc_digest = self._pending_resume = None
+        self._set_source(reader.name, f"[... reading {reader.name} as it arrives ...]")
+        self.stream = StreamRing(STREAM_KEEP_WORDS)
+        self.store = self.stream.store
+        self.has_content = False
+        self.loader = reader
+        reader.start()
+        self._poll_stream()
+
+    def _poll_stream(self):
+        reader = self.loader
+        if reader is None or self.stream is None: return
+        texts, size = [], 0
+        state = None
+        try:
+            while size < STREAM_FEED_CHARS:
+                kind, payload, _ = reader.queue.get_nowait()
+                if kind != "text":
+                    state = (kind, payload)
+                    break
+                texts.append(payload)
+                size += len(payload)
+        except queue.Empty:
+            if not reader.is_alive() and reader.queue.empty():
+                state = ("error", "The stream reader stopped unexpectedly")
+
+        if texts:
+            self.stream.feed("".join(texts))
+            self._trim_stream()
+            self.has_content = len(self.store) > 0
+            self._schedule_indexing()
+        if state is None:
+            if not self.is_running:
+                self.status.set_text(f"Following {reader.name} | {len(self.store)} words (Esc to stop)")
+            self.root.after(LOADER_POLL_MS, self._poll_stream)
+            return
+
+        self.loader = None
+        if state[0] == "error":
+            messagebox.showerror("Error", f"Could not read {reader.name}:\n{state[1]}")
+        elif not self.is_running:
+            self.status.set_text(f"End of {reader.name} | {len(self.store)} words")
+
+    def _trim_stream(self):
+        """Drops the oldest words once the ring is full, keeping the reading position"""
+        dropped = self.stream.trim()
+        if not dropped: return
+        index = self.current_index - dropped  # Negative: the reader fell behind and skips ahead
+        self.store = self.stream.store
+        self.engine.seek(max(0, index))
+
+    # =========================================================================
+    #  SAVED PROGRESS
+    # =========================================================================
+    def _current_settings(self):
+        return {
+            "wpm": self.wpm_var.get(),
+            "font_family": self.font_family,
+            "font_size": self.font_size,
+            "theme": self.current_theme_name,
+            "chunk_size": self.engine.chunk_size,
+            "auto_advance": self.auto_advance,
+            "reading_log": self.reading_log.enabled,
+        }
+
+    def _restore_settings(self):
+        saved = self.sessions.settings
+        self.font_family = saved.get("font_family", self.font_family)
+        self.font_size = saved.get("font_size", self.font_size)
+        if saved.get("theme") in THEMES:
+            self.current_theme_name = saved["theme"]
+        self.engine.chunk_size = saved.get("chunk_size", 1)
+
+    def _apply_document_settings(self, doc):
+        if doc.get("wpm"):
+            self.wpm_var.set(doc["wpm"])
+        if (doc.get("font_family"), doc.get("font_size")) != (None, None):
+            self.font_family = doc.get("font_family", self.font_family)
+            self.font_size = doc.get("font_size", self.font_size)
+            self.set_reader_font()
+        if doc.get("theme") in THEMES and doc["theme"] != self.current_theme_name:
+            self.apply_theme(doc["theme"])
+
+    def _try_resume(self, final=False):
+        """Jumps to the saved word once enough of the document is loaded"""
+        doc = self._pending_resume
+        if doc is None or self.is_running: return
+        index = doc.get("index", 0)
+        if index >= len(self.store) and not final: return
+        self._pending_resume = None
+        self._apply_document_settings(doc)
+        if not self.store: return
+        self.current_index = min(index, len(self.store) - 1)
+        self.draw_word_on_canvas(self.current_index)
+        self.update_progress()
+        self.btn_toggle.config(text="RESUME", bg=self.colors["accent"])
+
+    def _reopen_last_document(self):
+        doc = self.sessions.last_document()
+        if doc and doc.get("path") and os.path.isfile(doc["path"]):
+            self.open_document(doc["path"])
+
+    def _save_session(self, wait=False):
+        if self._session_save_job is not None:
+            self.root.after_cancel(self._session_save_job)
+            self._session_save_job = None
+        settings = self._current_settings()
+        self.sessions.update_settings(**settings)
+        if self.doc_digest and self._pending_resume is None:
+            self.sessions.update_document(self.doc_digest, index=self.current_index,
+                                          path=self.doc_path, **settings)
+        self.sessions.flush(wait)
+        self.reading_log.flush(wait)
+
+    def _schedule_session_save(self):
+        """Debounced save, for bursts like scrubbing or dragging a slider"""
+        if self._session_save_job is not None:
+            self.root.after_cancel(self._session_save_job)
+        self._session_save_job = self.root.after(SESSION_SAVE_DEBOUNCE_MS, self._save_session)
+
+    def _autosave(self):
+        # Runs on its own timer so run_loop never pays for saving
+        if self.is_running:
+            self._save_session()
+        self.root.after(SESSION_AUTOSAVE_MS, self._autosave)
+
+    def on_close(self):
+        if self.is_running:
+            self.reading_log.stop("close", self.current_index, self.engine.scheduler)
+        self._save_session(wait=True)
+        self.cancel_loading()
+        self.queue.clear()
+        if self._library_import is not None:
+            self._library_import[2].set()
+        self.root.destroy()
+
+    # =========================================================================
+    #  READING LOG
+    # =========================================================================
+    def show_reading_stats(self):
+        stats = self.reading_log.summary()
+        if not stats["sessions"]:
+            messagebox.showinfo("Reading Stats", "No reading sessions logged yet.\n"
+                                "Turn on 'Keep a reading log' and read for a while first.")
+            return
+        lines = [f"{stats['sessions']} sessions | {stats['words']} words in {format_minutes(stats['minutes'])}",
+                 f"Effective speed: {stats['effective_wpm']:.0f} WPM",
+                 f"Regressions: {stats['regressions']} | Speed changes: {stats['wpm_changes']}",
+                 "", "Recent days:"]
+        lines += [f"{d['day']}: {d['sessions']} sessions, {format_minutes(d['minutes'])}, "
+                  f"{d['effective_wpm']:.0f} WPM" for d in reversed(stats["days"])]
+        messagebox.showinfo("Reading Stats", "\n".join(lines))
+
+    def export_reading_log(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path: return
+        try:
+            self.reading_log.export(path)
+            self.status.set_text(f"Reading log exported to {os.path.basename(path)}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write reading log:\n{e}")
+
+    # =========================================================================
+    #  DIAGNOSTICS
+    # =========================================================================
+    def set_tracing(self, enabled):
+        if enabled and self.trace is None:
+            self.trace = FrameTrace()
+            self.status.take_spent()  # Only repaints from here on belong to the trace
+        elif not enabled:
+            self.trace = None
+            self.set_overlay(False)
+
+    def set_overlay(self, visible):
+        """Live jitter / effective WPM readout; needs (and enables) tracing"""
+        self.show_overlay = visible
+        if visible:
+            self.set_tracing(True)
+            self._update_overlay()
+        else:
+            self.canvas.itemconfig(self.overlay_item, text="")
+
+    def _first_frame(self):
+        """Records the launch -> first interactive frame time"""
+        self.root.update_idletasks()  # Flush the initial layout and redraw
+        self.startup_ms = (time.perf_counter() - LAUNCH_TIME) * 1000
+
+    def _update_overlay(self):
+        stats = self.trace.summary()
+        if stats is None:
+            text = "Frame timing: waiting for words..."
+        else:
+            text = (f"jitter {stats['jitter_ms']:.1f} ms | p95 late {stats['p95_late_ms']:.1f} ms | "
+                    f"{stats['effective_wpm']:.0f} WPM effective\n"
+                    f"draw {stats['draw_ms']:.2f} ms | progress {stats['progress_ms']:.2f} ms | "
+                    f"status {stats['status_ms']:.2f} ms | "
+                    f"layout cache {100 * self.renderer.layouts.hit_rate():.0f}% hits | "
+                    f"prepared {100 * self.renderer.prepared_rate():.0f}%")
+        if self.startup_ms is not None:
+            text += f"\nstartup {self.startup_ms:.0f} ms (budget {STARTUP_BUDGET_MS} ms)"
+        self.canvas.itemconfig(self.overlay_item, text=text)
+
+    def export_trace(self):
+        if self.trace is None or not len(self.trace):
+            messagebox.showinfo("Export Trace", "No frame timing recorded yet.\n"
+                                "Turn on 'Record frame timing' and read for a while first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path: return
+        try:
+            self.trace.export(path)
+            self.status.set_text(f"Trace of {len(self.trace)} words exported to {os.path.basename(path)}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write trace:\n{e}")
+
+    def _traced_frame(self, index, fired):
+        """draw + progress for one word, recording when each stage ran.
+
+        Status bar repaints since the previous word are booked on this one.
+        """
+        clock = self.engine.scheduler.clock
+        t0 = clock.now()
+        self.draw_word_on_canvas(index)
+        t1 = clock.now()
+        self.update_progress()
+        t2 = clock.now()
+        self.trace.record(index, self.engine.scheduler.deadline, fired, t1, t1 - t0, t2 - t1,
+                          self.status.take_spent())
+        if self.show_overlay and t2 - self._overlay_updated >= OVERLAY_REFRESH_MS:
+            self._overlay_updated = t2
+            self._update_overlay()
 
     def on_wpm_change(self, _):
         """Called when slider moves"""
@@ -412,27 +1494,27 @@ class GlanceApp:
         # If not running, we should show the new Total Time
         if not self.is_running:
             self.update_status_with_eta()
+        self.reading_log.wpm(self.wpm_var.get())
+        self._schedule_session_save()
 
     def update_status_with_eta(self):
         """Displays Total Word Count and Estimated Total Time"""
-        if not self.words:
-            self.status_bar.config(text="Ready | 0 words loaded")
+        if not self.store:
+            self.status.set_text("Ready | 0 words loaded")
             return
             
-        count = len(self.words)
-        wpm = self.wpm_var.get()
-        if wpm <= 0: wpm = 1 # Safety
-        
-        total_minutes = count / wpm
-        m = int(total_minutes)
-        s = int((total_minutes % 1) * 60)
-        
-        self.status_bar.config(text=f"Ready | {count} words | Total Time: {m}m {s}s")
+        count = len(self.store)
+        # Pacing-weighted, at the WPM the slider last held
+        total_time = format_minutes(self.engine.total_minutes())
+        self.status.set_text(f"Ready | {count} words | Total Time: {total_time}")
 
     def prepare_words(self):
+        if self.source_path is not None:
+            return len(self.store) > 0  # File-backed: the text box is a preview
         raw_text = self.text_input.get("1.0", tk.END)
-        self.words = raw_text.split()
-        if len(self.words) > 0:
+        self.store = TokenStore(raw_text)
+        self._schedule_indexing()
+        if len(self.store) > 0:
             self.has_content = True
             # Only update status if not currently reading to avoid flickering
             if not self.is_running:
@@ -440,144 +1522,267 @@ class GlanceApp:
             return True
         return False
 
-    def get_orp_index(self, word):
-        length = len(word)
-        if length == 1: return 0
-        if length >= 2 and length <= 5: return 1
-        if length >= 6 and length <= 9: return 2
-        if length >= 10 and length <= 13: return 3
-        return 4 
-
-    def draw_word_on_canvas(self, word):
-        self.canvas.delete("text")
-        if not word: return
+    def _schedule_retokenize(self):
+        """Debounced: re-split once typing pauses, not on every keystroke"""
+        if self.source_path is not None: return
+        if self._retokenize_job is not None:
+            self.root.after_cancel(self._retokenize_job)
+        self._retokenize_job = self.root.after(RETOKENIZE_DEBOUNCE_MS, self._retokenize)
+
+    def _retokenize(self):
+        if self._retokenize_job is not None:
+            self.root.after_cancel(self._retokenize_job)
+            self._retokenize_job = None
+        if self.source_path is not None: return
+        raw_text = self.text_input.get("1.0", tk.END)
+        if raw_text == self.store.text: return  # Cursor keys etc.
 
-        orp_idx = self.get_orp_index(word)
-        left_part = word[:orp_idx]
-        center_char = word[orp_idx]
-        right_part = word[orp_idx+1:]
+        first, removed, added = self.store.splice(raw_text)
+        self.doc_path = self.doc_digest = None  # Edited: no longer the file on disk
+        self.search.reset()
+        self._schedule_indexing()
 
-        w = self.canvas.winfo_width()
-        h = self.canvas.winfo_height()
-        cx, cy = w // 2, h // 2
-        
-        # Use dynamic fonts
-        font_spec_main = (self.font_family, self.font_size, "bold")
-
-        # Draw Center Char
-        self.canvas.create_text(
-            cx, cy, 
-            text=center_char, 
-            fill=self.colors["highlight"], 
-            font=font_spec_main, 
-            tags="text",
-            anchor="center" 
-        )
+        # Keep the reader's place: shift past the edit, snap into it
+        if self.current_index >= first + removed:
+            self.current_index += added - removed
+        elif self.current_index > first:
+            self.current_index = first
+        self.current_index = min(self.current_index, len(self.store))
+        self.has_content = len(self.store) > 0
 
-        # Measure center char to offset others
-        temp_font = font.Font(family=self.font_family, size=self.font_size, weight="bold")
-        center_width = temp_font.measure(center_char)
-
-        self.canvas.create_text(
-            cx - (center_width / 2), cy, 
-            text=left_part, 
-            fill=self.colors["fg_main"], 
-            font=font_spec_main, 
-            tags="text", 
-            anchor="e"
-        )
+        if self.is_running:
+            self.update_progress()
+        else:
+            self.update_status_with_eta()
 
-        self.canvas.create_text(
-            cx + (center_width / 2), cy, 
-            text=right_part, 
-            fill=self.colors["fg_main"], 
-            font=font_spec_main, 
-            tags="text", 
-            anchor="w"
-        )
+    def draw_word_on_canvas(self, index):
+        # One word, or in chunk mode the phrase that starts at index
+        end, text, orp_idx = self.engine.chunk(index)
+        self.renderer.show_word(text, orp_idx)
+        # Lay the next flash out hidden once this one is on screen
+        self._stage_index = end
+        if self._stage_job is None:
+            self._stage_job = self.root.after_idle(self._stage_next)
+        self._prewarm_layouts(end)
+
+    def _stage_next(self):
+        self._stage_job = None
+        if self._stage_index < len(self.store):
+            _, text, orp_idx = self.engine.chunk(self._stage_index)
+            self.renderer.prepare(text, orp_idx)
+
+    def set_reader_font(self):
+        # Restyles the word or "COMPLETED" text in place; layouts start over
+        self.renderer.set_font(self.font_family, self.font_size)
+        self._fit_chunks()
+        self._prewarm_next = self.current_index
+        self._prewarm_layouts(self.current_index)
+
+    def set_chunk_size(self, words):
+        self.engine.chunk_size = words
+        shown = self.renderer.shown
+        if shown and shown[0] == "word" and not self.is_running and self.current_index < len(self.store):
+            self.draw_word_on_canvas(self.current_index)
+
+    def _fit_chunks(self):
+        # Keep a chunk's right-hand side (about 2/3 of it) inside the canvas
+        char_w = max(1, self.renderer.font.measure("n"))
+        self.engine.chunk_max_chars = max(8, int(self.canvas.winfo_width() * 0.75 / char_w))
+
+    def _prewarm_layouts(self, start):
+        """Queue measuring of the upcoming words' layouts for idle time.
+
+        Tk can only measure text on its own thread, so "background" means
+        small idle-time batches between word deadlines. The draw for each
+        upcoming word (or chunk) then finds its layout already cached.
+        """
+        self._prewarm_end = min(len(self.store), start + PREWARM_WORDS)
+        if not start <= self._prewarm_next <= start + PREWARM_WORDS:
+            self._prewarm_next = start  # Jumped (scrub, seek): start over here
+        if self._prewarm_job is None and self._prewarm_next < self._prewarm_end:
+            self._prewarm_job = self.root.after_idle(self._prewarm_step)
+
+    def _prewarm_step(self):
+        self._prewarm_job = None
+        layouts = self.renderer.layouts
+        i = self._prewarm_next
+        stop = min(i + PREWARM_BATCH, self._prewarm_end, len(self.store))
+        while i < stop:
+            i, text, orp_idx = self.engine.chunk(i)
+            layouts.prewarm(text, orp_idx)
+        self._prewarm_next = max(self._prewarm_next, i)
+        if self._prewarm_next < self._prewarm_end:
+            self._prewarm_job = self.root.after_idle(self._prewarm_step)
+
+    def _cancel_tick(self):
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+            self._tick_job = None
 
     def toggle_reading(self):
+        self._auto_start = False  # Pressed by hand or fired once: either way it is settled
         if self.is_running:
             self.is_running = False
+            self._cancel_tick()
             self.btn_toggle.config(text="RESUME", bg=self.colors["accent"])
+            self.status.set_text(f"Paused | {self.engine.scheduler.summary()}")
+            self.reading_log.stop("pause", self.current_index, self.engine.scheduler)
+            self._save_session()
         else:
-            if not self.has_content:
+            if self._retokenize_job is not None:
+                self._retokenize()  # Don't start on a stale index
+            if not self.has_content and self.stream is None:  # A stream may start before its first word
                 if not self.prepare_words(): return
             
-            # FIX: If we finished reading (index at end), reset to start automatically
-            if self.current_index >= len(self.words):
-                self.current_index = 0
-            
+            self._pending_resume = None  # Reading from here supersedes the saved spot
+            self._load_pacing_rules()
             self.is_running = True
             self.btn_toggle.config(text="PAUSE", bg=self.colors["highlight"])
+            self.engine.start(rewind=self.loader is None)  # Only a finished document restarts from the top
+            self.reading_log.start(self.doc_digest, self.doc_path, self.current_index,
+                                   self.engine.wpm, self.engine.chunk_size)
             self.run_loop()
 
+    def _load_pacing_rules(self):
+        """Picks up edits to pacing.json; factors are recomputed only if the rules changed"""
+        try:
+            mtime = os.path.getmtime(PACING_RULES_PATH)
+        except OSError:
+            mtime = None
+        if mtime != self._rules_mtime:
+            self._rules_mtime = mtime
+            self.engine.set_rules(PacingRules.load())
+
     def reset_reader(self):
+        if self.is_running:
+            self.reading_log.stop("switch", self.current_index, self.engine.scheduler)
         self.is_running = False
+        self._cancel_tick()
         self.current_index = 0
         self.btn_toggle.config(text="START READING", bg=self.colors["accent"])
-        self.canvas.delete("text")
+        self.renderer.clear()
         self.update_progress()
         self.update_status_with_eta() # Show total time again
 
+    def _jump(self, move, *args):
+        """Moves with an engine seek and redraws there (scrub, seek, search, progress bar)"""
+        before = self.current_index
+        move(*args)
+        self.reading_log.seek(before, self.current_index)
+        self.draw_word_on_canvas(self.current_index)
+        self.update_progress()
+        self._schedule_session_save()
+
     def scrub_forward(self):
-        if self.words:
-            self.current_index = min(len(self.words) - 1, self.current_index + 10)
-            self.draw_word_on_canvas(self.words[self.current_index])
-            self.update_progress()
+        if self.store:
+            self._jump(self.engine.step, 10)
 
     def scrub_backward(self):
-        if self.words:
-            self.current_index = max(0, self.current_index - 10)
-            self.draw_word_on_canvas(self.words[self.current_index])
-            self.update_progress()
+        if self.store:
+            self._jump(self.engine.step, -10)
+
+    def seek_sentence(self, direction):
+        if self.store:
+            self._jump(self.engine.seek_sentence, direction)
+
+    def seek_paragraph(self, direction):
+        if self.store:
+            self._jump(self.engine.seek_paragraph, direction)
+
+    def _on_progress_drag(self, event):
+        # Only the bar follows the pointer; the word is drawn once, on release
+        if not self.store: return
+        width = max(1, self.progress_canvas.winfo_width())
+        self._seek_preview = min(max(event.x / width, 0.0), 1.0)
+        self.update_progress()
+
+    def _on_progress_release(self, event):
+        if self._seek_preview is None: return
+        self._on_progress_drag(event)
+        fraction, self._seek_preview = self._seek_preview, None
+        self._jump(self.engine.seek_fraction, fraction)
 
     def update_progress(self):
-        if not self.words: return
-        pct = self.current_index / len(self.words)
-        canvas_width = self.progress_canvas.winfo_width()
-        self.progress_canvas.coords(self.progress_rect, 0, 0, canvas_width * pct, 6)
-        
-        # Stats
-        wpm = self.wpm_var.get()
-        words_left = len(self.words) - self.current_index
-        minutes_left = words_left / wpm
-        time_str = f"{int(minutes_left)}m {int((minutes_left % 1) * 60)}s"
-        self.status_bar.config(text=f"Progress: {self.current_index}/{len(self.words)} | Remaining: {time_str}")
-
-    def calculate_delay(self, word):
-        base_wpm = self.wpm_var.get()
-        base_delay = (60 / base_wpm) * 1000
-        factor = 1.0
-        if ',' in word or ';' in word: factor = 1.5
-        elif '.' in word or '!' in word or '?' in word: factor = 2.0
-        elif len(word) > 8: factor = 1.3
-        return int(base_delay * factor)
+        # Coalesced: the bar and status line repaint on the next frame at most
+        self.status.invalidate()
+
+    def _progress_fields(self):
+        count = len(self.store)
+        if not count: return 0.0, None
+        engine = self.engine
+        if self._seek_preview is not None:
+            target = min(int(self._seek_preview * count), count - 1)
+            return self._seek_preview, f"Seek to {target}/{count} ({format_minutes(engine.minutes_at(target))})"
+        # Constant time: both readouts are prefix-sum lookups
+        at, total = engine.minutes_at(self.current_index), engine.total_minutes()
+        return self.current_index / count, (f"Progress: {self.current_index}/{count} | "
+                                            f"{format_minutes(at)} of {format_minutes(total)} | "
+                                            f"Remaining: {format_minutes(total - at)}")
 
     def run_loop(self):
+        self._tick_job = None
         if not self.is_running: return
-
-        if self.current_index < len(self.words):
-            word = self.words[self.current_index]
-            self.draw_word_on_canvas(word)
-            self.update_progress()
-            self.current_index += 1
-            delay = self.calculate_delay(word)
-            self.root.after(delay, self.run_loop)
+        fired = self.engine.scheduler.clock.now() if self.trace is not None else 0.0
+
+        if self.engine.at_end() and self.loader is not None:
+            # Caught up with the background loader: wait for the next chunk
+            if not self._starved:
+                self.status.set_text("Caught up | waiting for more text...")
+            self._starved = True
+            self._tick_job = self.root.after(LOADER_POLL_MS, self.run_loop)
+            return
+        if self._starved:
+            self._starved = False
+            self.engine.scheduler.resync()
+
+        index = self.engine.next_word()
+        if index is not None:
+            if self.trace is None:
+                self.draw_word_on_canvas(index)
+                self.update_progress()
+            else:
+                self._traced_frame(index, fired)
+            # Wait until the next absolute deadline, not a fresh relative delay
+            wait = self.engine.advance()
+            self._tick_job = self.root.after(wait, self.run_loop)
         else:
             self.is_running = False
+            self.reading_log.stop("end", self.current_index, self.engine.scheduler)
+            if self.queue and self._advance_queue():
+                return
+            self.status.set_text(f"Completed | {self.engine.scheduler.summary()}")
             self.btn_toggle.config(text="READ AGAIN", bg=self.colors["accent"])
-            self.canvas.delete("text") # Ensure clear
-            self.canvas.create_text(
-                self.canvas.winfo_width()//2, 
-                self.canvas.winfo_height()//2, 
-                text="COMPLETED", 
-                fill=self.colors["accent"], 
-                font=(self.font_family, self.font_size, "bold"),
-                tags="text" # FIX: Add tag so it gets deleted next time
-            )
+            self.renderer.show_message("COMPLETED")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Glance speed reader")
+    parser.add_argument("--tui", action="store_true",
+                        help="read in the terminal instead of a window (see glance_tui.py --help)")
+    parser.add_argument("--stream", nargs="?", const="-", metavar="FILE",
+                        help="read text as it is produced: from stdin, or FILE as it grows")
+    parser.add_argument("--import-library", metavar="FOLDER",
+                        help="tokenize every document under FOLDER into the cache, then exit")
+    args, rest = parser.parse_known_args()
+    if args.import_library:
+        library = Library()
+        result = library.import_folder(
+            args.import_library, progress=lambda done, total: print(f"\r{done}/{total} files", end="", flush=True))
+        print(f"\n{result['imported']} imported, {result['unchanged']} unchanged, "
+              f"{result['removed']} removed, {len(result['errors'])} failed")
+        for path, message in result["errors"]:
+            print(f"  {path}: {message}")
+        count, words, minutes = library.summary(350)
+        print(f"Library: {count} documents, {words:,} words, {format_minutes(minutes)} at 350 WPM")
+        sys.exit(1 if result["errors"] else 0)
+    if args.tui:
+        import glance_tui
+        sys.exit(glance_tui.main(rest, prog="Glance.py --tui"))
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if tk is None:
+        parser.error("the window needs tkinter (python3-tk); use --tui to read in the terminal")
     root = tk.Tk()
-    app = GlanceApp(root)
+    app = GlanceApp(root, reopen_last=args.stream is None)
+    if args.stream is not None:
+        root.after_idle(app.open_stream, args.stream)
     root.mainloop()
@@ -0,0 +1,359 @@
+"""
+Glance benchmark suite.
+
+    python benchmarks.py all --json results.json
+    python benchmarks.py pacing --virtual
+
+Suites: tokenize, pacing, memory, render, startup. Every suite prints a readable
+summary and returns its metrics; --json writes them all, plus the commit
+and platform, so runs can be compared between versions.
+
+The render and startup suites need a display. On a headless box run them
+under a virtual X server: `xvfb-run -a python benchmarks.py render`.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from glance_engine import MonotonicClock, PacingRules, ReadingEngine, TokenStore, VirtualClock, get_orp_index
+
+SAMPLE = ("The average reading speed of an adult is around two hundred and fifty "
+          "words per minute, but with practice, rapid serial visual presentation "
+          "lets trained readers comfortably exceed that; sometimes by far!").split()
+
+
+def make_corpus(n_words, seed=1):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(SAMPLE) for _ in range(n_words))
+
+
+def _stats(samples, scale=1.0):
+    """mean / median / p95 / max of samples, multiplied by scale"""
+    values = sorted(v * scale for v in samples)
+    if not values:
+        return {"mean": 0.0, "median": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "p95": values[max(0, int(len(values) * 0.95) - 1)],
+        "max": values[-1],
+    }
+
+
+def _report(name, stats, unit):
+    print(f"  {name:<14} mean {stats['mean']:9.1f} {unit} | median {stats['median']:9.1f} {unit} | "
+          f"p95 {stats['p95']:9.1f} {unit}")
+
+
+# =============================================================================
+#  TOKENIZE: throughput on large corpora
+# =============================================================================
+def bench_tokenize(args):
+    print("Tokenize")
+    results = {}
+    for n_words in args.sizes:
+        text = make_corpus(n_words)
+        t0 = time.perf_counter()
+        store = TokenStore(text)
+        elapsed = time.perf_counter() - t0
+
+        # A one-word edit in the middle, as typed into the text box
+        mid = len(text) // 2
+        t0 = time.perf_counter()
+        store.splice(text[:mid] + "x" + text[mid:])
+        splice_s = time.perf_counter() - t0
+
+        # Whole-document pacing factors, as recomputed after a rules change
+        t0 = time.perf_counter()
+        PacingRules().compute(store)
+        pacing_s = time.perf_counter() - t0
+
+        results[str(n_words)] = {
+            "seconds": elapsed,
+            "words_per_s": n_words / elapsed,
+            "mb_per_s": len(text) / elapsed / 1e6,
+            "splice_ms": splice_s * 1000,
+            "pacing_ms": pacing_s * 1000,
+        }
+        print(f"  {n_words:>9} words | {elapsed:6.2f}s | {n_words / elapsed / 1e6:5.2f}M words/s | "
+              f"{len(text) / elapsed / 1e6:5.1f} MB/s | edit splice {splice_s * 1000:6.1f} ms | "
+              f"pacing {pacing_s * 1000:6.1f} ms")
+    return results
+
+
+# =============================================================================
+#  PACING: jitter and achieved WPM
+# =============================================================================
+def _run_pacing(wpm, n_words, render_ms, virtual, rng, chunk=1):
+    """Drives a ReadingEngine like run_loop does; returns onset lateness (ms)"""
+    clock = VirtualClock() if virtual else MonotonicClock()
+    store = TokenStore(make_corpus(n_words, seed=wpm))
+    engine = ReadingEngine(store, wpm=wpm, clock=clock, chunk_size=chunk)
+    engine.start()
+    lateness = []
+
+    while True:
+        index = engine.next_word()
+        if index is None: break
+        lateness.append(clock.now() - engine.scheduler.deadline)
+        # Stand-in for drawing the word and updating the status bar
+        if virtual:
+            clock.advance(render_ms * rng.uniform(0.5, 1.5))
+        else:
+            end = time.perf_counter() + render_ms / 1000
+            while time.perf_counter() < end: pass
+        wait = engine.advance()
+        # Stand-in for Tk's timer, which always fires a little late
+        if virtual:
+            clock.advance(wait + rng.uniform(0, 4))
+        else:
+            time.sleep(wait / 1000)
+
+    sched = engine.scheduler
+    return {
+        "flashes": len(lateness),
+        "requested_wpm": sched.requested_wpm(),
+        "achieved_wpm": sched.achieved_wpm(),
+        "skipped": sched.skipped,
+        "onset_lateness_ms": _stats(lateness),
+    }
+
+
+def bench_pacing(args):
+    mode = "virtual clock" if args.virtual else "real time"
+    print(f"Pacing ({mode}, {args.render_ms} ms render cost per flash, up to {args.chunk} words each)")
+    rng = random.Random(7)
+    results = {}
+    for wpm in range(args.min_wpm, args.max_wpm + 1, args.step):
+        n_words = max(20, int(args.seconds * wpm / 60))
+        r = _run_pacing(wpm, n_words, args.render_ms, args.virtual, rng, args.chunk)
+        results[str(wpm)] = r
+        late = r["onset_lateness_ms"]
+        print(f"  {wpm:>5} WPM | achieved {r['achieved_wpm']:7.1f} of {r['requested_wpm']:7.1f} | "
+              f"lateness mean {late['mean']:5.2f} ms, p95 {late['p95']:5.2f} ms | skipped {r['skipped']}")
+    return results
+
+
+# =============================================================================
+#  MEMORY: token store vs. list of str
+# =============================================================================
+def _traced(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def bench_memory(args):
+    text = make_corpus(args.words)
+    print(f"Memory ({args.words} words, {len(text) / 1e6:.1f}M characters)")
+    # The text itself is shared by both layouts, so only count what each adds
+    words, list_bytes = _traced(text.split)
+    del words
+    store, store_bytes = _traced(lambda: TokenStore(text))
+    print(f"  list[str]   {list_bytes / 1e6:8.1f} MB | {list_bytes / args.words:5.1f} B/word")
+    print(f"  TokenStore  {store_bytes / 1e6:8.1f} MB | {store_bytes / len(store):5.1f} B/word"
+          " (incl. ORP column and boundary index)")
+    return {
+        "words": args.words,
+        "list_bytes_per_word": list_bytes / args.words,
+        "store_bytes_per_word": store_bytes / len(store),
+        "saving": list_bytes / store_bytes,
+    }
+
+
+# =============================================================================
+#  RENDER: per-word canvas cost against a real Tk canvas
+# =============================================================================
+def legacy_draw(canvas, word, family, size, cx, cy):
+    """The original draw_word_on_canvas: delete + 3 creates + a fresh Font"""
+    from tkinter import font
+    canvas.delete("text")
+    orp_idx = get_orp_index(word)
+    spec = (family, size, "bold")
+    canvas.create_text(cx, cy, text=word[orp_idx], fill="#ff4444", font=spec, tags="text", anchor="center")
+    center_width = font.Font(family=family, size=size, weight="bold").measure(word[orp_idx])
+    canvas.create_text(cx - center_width / 2, cy, text=word[:orp_idx], fill="#d4d4d4", font=spec, tags="text", anchor="e")
+    canvas.create_text(cx + center_width / 2, cy, text=word[orp_idx+1:], fill="#d4d4d4", font=spec, tags="text", anchor="w")
+
+
+def bench_render(args):
+    import tkinter as tk
+    from Glance import WordRenderer
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Render: skipped, no display ({e}). Try xvfb-run.")
+        return {"skipped": str(e)}
+    root.geometry("900x500")
+    canvas = tk.Canvas(root, width=900, height=500, highlightthickness=0)
+    canvas.pack()
+    root.update()
+    family, size = "Courier New", args.font_size
+    words = [SAMPLE[i % len(SAMPLE)] for i in range(args.render_words)]
+
+    def run(draw, prepare=None):
+        samples = []
+        for i, w in enumerate(words):
+            t0 = time.perf_counter()
+            draw(w)
+            root.update_idletasks()  # Include the actual redisplay
+            samples.append(time.perf_counter() - t0)
+            if prepare is not None and i + 1 < len(words):
+                prepare(words[i + 1])  # Between deadlines, outside the timed part
+        return _stats(samples, 1e6)
+
+    print(f"Render ({args.render_words} words at font size {size})")
+    before = run(lambda w: legacy_draw(canvas, w, family, size, 450, 250))
+    _report("delete/create", before, "us")
+    canvas.delete("text")
+
+    renderer = WordRenderer(canvas, family, size)
+    renderer.set_colors("#d4d4d4", "#ff4444", "#007acc")
+    renderer.resize(900, 500)
+    after = run(lambda w: renderer.show_word(w, get_orp_index(w)))
+    _report("persistent", after, "us")
+    print(f"  Speed-up: {before['mean'] / after['mean']:.1f}x")
+    # Next word laid out hidden ahead of time: the deadline only swaps sets
+    swapped = run(lambda w: renderer.show_word(w, get_orp_index(w)),
+                  lambda w: renderer.prepare(w, get_orp_index(w)))
+    _report("double-buffered", swapped, "us")
+    print(f"  Speed-up: {before['mean'] / swapped['mean']:.1f}x")
+    root.destroy()
+    return {"font_size": size, "legacy_us": before, "persistent_us": after, "double_buffered_us": swapped}
+
+
+# =============================================================================
+#  STARTUP: launch to first interactive frame
+# =============================================================================
+STARTUP_PROBE = """
+import time
+t0 = time.perf_counter()
+import tkinter as tk
+import Glance
+root = tk.Tk()
+app = Glance.GlanceApp(root)
+
+def ready():
+    if app.startup_ms is None:
+        root.after(5, ready)
+        return
+    process_ms = (time.perf_counter() - t0) * 1000
+    t1 = time.perf_counter()
+    app.open_settings()
+    root.update_idletasks()
+    settings_ms = (time.perf_counter() - t1) * 1000
+    app.settings_window.withdraw()
+    t1 = time.perf_counter()
+    app.open_settings()
+    root.update_idletasks()
+    reopen_ms = (time.perf_counter() - t1) * 1000
+    print(app.startup_ms, process_ms, settings_ms, reopen_ms, Glance.STARTUP_BUDGET_MS)
+    root.destroy()
+
+root.after_idle(ready)
+root.mainloop()
+"""
+
+
+def bench_startup(args):
+    # A fresh home: no saved session to reopen and no font cache on the first run
+    home = tempfile.mkdtemp(prefix="glance-startup-")
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(args.startup_runs):
+        proc = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=here, env=env,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            reason = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+            print(f"Startup: skipped ({reason}). Try xvfb-run.")
+            return {"skipped": reason}
+        runs.append([float(v) for v in proc.stdout.split()])
+
+    budget = runs[0][4]
+    first, warm = runs[0], runs[1:] or runs
+    app_ms = _stats([r[0] for r in warm])
+    print(f"Startup ({len(runs)} launches, budget {budget:.0f} ms to first frame)")
+    print(f"  first launch   {first[0]:7.1f} ms to first frame | {first[1]:7.1f} ms incl. imports | "
+          f"settings {first[2]:6.1f} ms")
+    _report("warm launch", app_ms, "ms")
+    print(f"  settings       first open {statistics.fmean(r[2] for r in warm):6.1f} ms | "
+          f"reopen {statistics.fmean(r[3] for r in warm):6.1f} ms")
+    verdict = "within" if app_ms["p95"] <= budget else "OVER"
+    print(f"  p95 {app_ms['p95']:.1f} ms: {verdict} budget")
+    return {
+        "budget_ms": budget,
+        "first_launch_ms": first[0],
+        "warm_launch_ms": app_ms,
+        "process_ms": _stats([r[1] for r in warm]),
+        "settings_open_ms": _stats([r[2] for r in warm]),
+        "settings_reopen_ms": _stats([r[3] for r in warm]),
+        "within_budget": app_ms["p95"] <= budget,
+    }
+
+
+# =============================================================================
+#  RUNNER
+# =============================================================================
+SUITES = {
+    "tokenize": bench_tokenize,
+    "pacing": bench_pacing,
+    "memory": bench_memory,
+    "render": bench_render,
+    "startup": bench_startup,
+}
+
+
+def _meta():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Glance benchmarks")
+    parser.add_argument("suite", choices=list(SUITES) + ["all"])
+    parser.add_argument("--json", metavar="PATH", help="Write machine-readable results here")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="tokenize: corpus sizes in words")
+    parser.add_argument("--min-wpm", type=int, default=100)
+    parser.add_argument("--max-wpm", type=int, default=1000)
+    parser.add_argument("--step", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=2.0, help="pacing: reading time per WPM level")
+    parser.add_argument("--render-ms", type=float, default=2.0, help="pacing: simulated draw cost per word")
+    parser.add_argument("--virtual", action="store_true", help="pacing: deterministic virtual clock")
+    parser.add_argument("--chunk", type=int, default=1, help="pacing: words per flash (chunk mode)")
+    parser.add_argument("--words", type=int, default=1_000_000, help="memory: corpus size in words")
+    parser.add_argument("--render-words", type=int, default=2000, help="render: words to draw")
+    parser.add_argument("--font-size", type=int, default=120)
+    parser.add_argument("--startup-runs", type=int, default=5, help="startup: launches to time")
+    args = parser.parse_args()
+
+    names = list(SUITES) if args.suite == "all" else [args.suite]
+    results = {}
+    for name in names:
+        results[name] = SUITES[name](args)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": _meta(), "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
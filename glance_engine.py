@@ -0,0 +1,1929 @@
+"""
+Headless reading engine for Glance.
+
+Tokenizing, ORP / pacing, scheduling, file loading and saved sessions live
+here with no Tk dependency, so they can be driven by the GUI, benchmarked
+or reused by other front ends.
+"""
+import codecs
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import posixpath
+import queue
+import re
+import string
+import struct
+import sys
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html.parser import HTMLParser
+from itertools import accumulate
+from urllib.parse import unquote
+
+# =============================================================================
+#  TOKEN STORE
+# =============================================================================
+WORD_RE = re.compile(r"\S+")
+GLANCE_HOME = os.path.join(os.path.expanduser("~"), ".glance")
+CACHE_DIR = os.path.join(GLANCE_HOME, "cache")
+TOKEN_CACHE_MAGIC = b"GLTOK03\n"  # Bump when tokenizing or scoring rules change
+EDIT_LOG = 16  # Splices a TokenStore remembers for incremental re-pacing
+PARAGRAPH_RE = re.compile(r"\n[^\S\n]*\n")  # A blank line
+SENTENCE_END_RE = re.compile(r"[.!?\u2026][\"')\]\u00bb\u201d\u2019]*$")
+ABBREVIATIONS = frozenset("mr. mrs. ms. dr. st. vs. etc. e.g. i.e. cf.".split())
+SESSIONS_PATH = os.path.join(GLANCE_HOME, "sessions.json")
+FONTS_PATH = os.path.join(GLANCE_HOME, "fonts.json")
+READING_LOG_PATH = os.path.join(GLANCE_HOME, "reading_log.jsonl")
+LIBRARY_PATH = os.path.join(GLANCE_HOME, "library.json")
+MAX_SAVED_DOCUMENTS = 500
+
+def get_orp_index(word):
+    """Optimal Recognition Point: which character the eye should fixate on"""
+    length = len(word)
+    if length == 1: return 0
+    if length >= 2 and length <= 5: return 1
+    if length >= 6 and length <= 9: return 2
+    if length >= 10 and length <= 13: return 3
+    return 4
+
+
+def ends_sentence(word):
+    """True if a sentence ends with this word (common abbreviations aside)"""
+    return SENTENCE_END_RE.search(word) is not None and word.lower() not in ABBREVIATIONS
+
+
+def _common_prefix_len(a, b, block=65536):
+    """Length of the shared prefix, compared block-wise in C"""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i:i + block] == b[i:i + block]:
+        i += block
+    if i >= n: return n
+    end = min(i + block, n)
+    while i < end and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _common_suffix_len(a, b, limit, block=65536):
+    """Length of the shared suffix, never reaching back past `limit` chars"""
+    la, lb = len(a), len(b)
+    i = 0
+    while i + block <= limit and a[la - i - block:la - i] == b[lb - i - block:lb - i]:
+        i += block
+    while i < limit and a[la - i - 1] == b[lb - i - 1]:
+        i += 1
+    return i
+
+
+def chunk_orp_index(text):
+    """ORP for a multi-word chunk: a little left of centre, never on a space"""
+    if " " not in text: return get_orp_index(text)
+    i = int(len(text) * 0.35)
+    return i + 1 if text[i] == " " else i
+
+
+class TokenStore:
+    """Every word of a document as text chunks plus parallel columns.
+
+    starts/ends are global offsets into the concatenated chunks. orp holds
+    each word's ORP index, filled in the same pass that finds the words, so
+    the reading loop never re-inspects strings. Costs ~9 bytes per word
+    instead of a str object (~55 bytes) plus a list slot each. Pacing is
+    not stored here: see PacingRules.
+
+    sentences and paragraphs are the sorted indices of the words that open
+    one, found in the same pass; a paragraph starts after a blank line.
+
+    Text typed into the box is a single chunk; streamed files grow one
+    chunk at a time via append(). Words never straddle two chunks.
+    """
+    def __init__(self, text="", base=0):
+        self.chunks = [text]
+        self.chunk_starts = [base]  # Global offset of each chunk
+        self.starts = array("I")  # uint32: documents up to 4G characters
+        self.ends = array("I")
+        self.orp = array("B")
+        self.sentences = array("I")
+        self.paragraphs = array("I")
+        self.version = 0  # Bumped by splice(): derived data must be rebuilt
+        self.edits = []  # (version, first, removed, added) of the last few splices
+        self._scan(text, base)
+
+    @property
+    def text(self):
+        if len(self.chunks) > 1:
+            # Consolidate so the next access (and splice) is free
+            self.chunks = ["".join(self.chunks)]
+            self.chunk_starts = self.chunk_starts[:1]
+        return self.chunks[0]
+
+    def _scan(self, text, base=0, lo=0, hi=None):
+        """Tokenizes text[lo:hi], appending to the columns"""
+        hi = len(text) if hi is None else hi
+        add_start, add_end = self.starts.append, self.ends.append
+        add_orp = self.orp.append
+        add_sentence, add_paragraph = self.sentences.append, self.paragraphs.append
+        n = len(self.starts)
+        if n:  # Continuing after word n-1 (a splice): it decides the first boundary
+            new_sentence = ends_sentence(self[n - 1])
+            breaks = [m.end() for m in PARAGRAPH_RE.finditer(text, self.ends[n - 1] - base, hi)]
+        else:
+            new_sentence = True
+            breaks = [lo] + [m.end() for m in PARAGRAPH_RE.finditer(text, lo, hi)]
+        breaks.append(hi + 1)
+        b, next_break = 0, breaks[0]
+        seen = {}  # Text is Zipfian: most words repeat, so classify each once
+        for m in WORD_RE.finditer(text, lo, hi):
+            word = m.group()
+            info = seen.get(word)
+            if info is None:
+                info = seen[word] = (get_orp_index(word), ends_sentence(word))
+            start, end = m.span()
+            if start >= next_break:
+                add_paragraph(n)
+                new_sentence = True
+                while breaks[b] <= start: b += 1
+                next_break = breaks[b]
+            if new_sentence: add_sentence(n)
+            new_sentence = info[1]
+            add_start(base + start)
+            add_end(base + end)
+            add_orp(info[0])
+            n += 1
+
+    def words(self, start=0, end=None):
+        """Words start..end as a list of str, split from the text in bulk"""
+        end = len(self.starts) if end is None else end
+        starts, ends, chunk_starts = self.starts, self.ends, self.chunk_starts
+        words = []
+        i = start
+        while i < end:
+            # Every run of words inside one chunk is a single slice + split()
+            c = bisect_right(chunk_starts, starts[i]) - 1
+            j = end if c + 1 == len(chunk_starts) else bisect_left(starts, chunk_starts[c + 1], i, end)
+            base = chunk_starts[c]
+            words += self.chunks[c][starts[i] - base:ends[j - 1] - base].split()
+            i = j
+        return words
+
+    def last_word(self):
+        return self[len(self.starts) - 1] if self.starts else ""
+
+    def leading_text(self):
+        """Whitespace before the first word of the first chunk"""
+        if not self.starts: return self.chunks[0]
+        return self.chunks[0][:self.starts[0] - self.chunk_starts[0]]
+
+    def trailing_text(self):
+        """Whitespace after the last word, which may span several chunks"""
+        if not self.starts: return "".join(self.chunks)
+        end = self.ends[-1]
+        c = bisect_right(self.chunk_starts, end - 1) - 1
+        return self.chunks[c][end - self.chunk_starts[c]:] + "".join(self.chunks[c + 1:])
+
+    def append(self, piece):
+        """Adopts a store tokenized elsewhere (e.g. on a loader thread).
+
+        The piece must have been built with base=self.char_count().
+        """
+        gap = self.trailing_text() + piece.leading_text() if piece.starts else ""
+        sentences, paragraphs = _piece_boundaries(self.last_word(), gap, piece, len(self.starts))
+        self.sentences.extend(sentences)
+        self.paragraphs.extend(paragraphs)
+        self.chunks.extend(piece.chunks)
+        self.chunk_starts.extend(piece.chunk_starts)
+        self.starts.extend(piece.starts)
+        self.ends.extend(piece.ends)
+        self.orp.extend(piece.orp)
+
+    def char_count(self):
+        return self.chunk_starts[-1] + len(self.chunks[-1])
+
+    def tail(self, start):
+        """A new store of the words from start on, offsets rebased to 0.
+
+        Lets a live stream drop its oldest words without re-tokenizing the rest.
+        """
+        store = TokenStore()
+        if start >= len(self.starts): return store
+        offset = self.starts[start]
+        store.chunks = [self.text[offset - self.chunk_starts[0]:]]
+        store.starts = array("I", [s - offset for s in self.starts[start:]])
+        store.ends = array("I", [e - offset for e in self.ends[start:]])
+        store.orp = self.orp[start:]
+        for bounds, old in ((store.sentences, self.sentences), (store.paragraphs, self.paragraphs)):
+            rest = old[bisect_left(old, start):]
+            if not rest or rest[0] != start:
+                bounds.append(0)  # Like any store, the first word opens both
+            bounds.extend(i - start for i in rest)
+        return store
+
+    def splice(self, new_text):
+        """Swaps in an edited text, re-tokenizing only the changed region.
+
+        Returns (first, removed, added): tokens [first, first + removed) of
+        the old index were replaced by `added` new tokens.
+        """
+        old = self.text
+        prefix = _common_prefix_len(old, new_text)
+        suffix = _common_suffix_len(old, new_text, min(len(old), len(new_text)) - prefix)
+        old_end = len(old) - suffix
+        delta = len(new_text) - len(old)
+
+        # Widen to every token touching the edit: typing next to a word joins it
+        first = bisect_left(self.ends, prefix)
+        last = bisect_right(self.starts, old_end)
+        lo, hi = prefix, old_end
+        if first < last:
+            lo = min(lo, self.starts[first])
+            hi = max(hi, self.ends[last - 1])
+
+        self.version += 1
+        tail = [col[last:] for col in (self.starts, self.ends, self.orp)]
+        for col in (self.starts, self.ends, self.orp):
+            del col[first:]
+        # The first word after the edit gets its boundaries re-decided below
+        bounds_tail = []
+        for bounds in (self.sentences, self.paragraphs):
+            bounds_tail.append(bounds[bisect_right(bounds, last):])
+            del bounds[bisect_left(bounds, first):]
+        self.chunks = [new_text]
+        self._scan(new_text, 0, lo, hi + delta)
+        added = len(self.starts) - first
+
+        if delta:
+            tail[0] = array("I", map(delta.__add__, tail[0]))
+            tail[1] = array("I", map(delta.__add__, tail[1]))
+        for col, rest in zip((self.starts, self.ends, self.orp), tail):
+            col.extend(rest)
+
+        shift, j = added - (last - first), first + added
+        if j < len(self.starts):
+            paragraph = j == 0 or PARAGRAPH_RE.search(new_text, self.ends[j - 1], self.starts[j]) is not None
+            sentence = paragraph or ends_sentence(self[j - 1])
+            for bounds, rest, opens in zip((self.sentences, self.paragraphs), bounds_tail, (sentence, paragraph)):
+                if opens: bounds.append(j)
+                bounds.extend(map(shift.__add__, rest) if shift else rest)
+        self.edits.append((self.version, first, last - first, added))
+        del self.edits[:-EDIT_LOG]
+        return first, last - first, added
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        start, end = self.starts[i], self.ends[i]
+        c = 0 if len(self.chunks) == 1 else bisect_right(self.chunk_starts, start) - 1
+        base = self.chunk_starts[c]
+        return self.chunks[c][start - base:end - base]
+
+    def dump(self, f):
+        """Writes the store to a seekable binary file (see dump_tokens)"""
+        dump_tokens(f, [self])
+
+    @classmethod
+    def load(cls, f):
+        magic, count, size = struct.unpack("<8sQQ", f.read(24))
+        if magic != TOKEN_CACHE_MAGIC:
+            raise ValueError("not a Glance token cache (or an older format)")
+        n_sentences, n_paragraphs = struct.unpack("<QQ", f.read(16))
+        store = cls()
+        for col in (store.starts, store.ends, store.orp):
+            col.fromfile(f, count)
+        store.sentences.fromfile(f, n_sentences)
+        store.paragraphs.fromfile(f, n_paragraphs)
+        store.chunks = [f.read(size).decode("utf-8")]
+        return store
+
+    def nbytes(self):
+        """Approximate memory held by the store, text included"""
+        cols = (self.starts, self.ends, self.orp, self.sentences, self.paragraphs)
+        return (sum(sys.getsizeof(c) for c in self.chunks) +
+                sum(c.itemsize * len(c) for c in cols))
+
+
+# =============================================================================
+#  FILE LOADING
+# =============================================================================
+def _piece_boundaries(prev_word, gap, piece, offset):
+    """A piece's sentence/paragraph starts, renumbered to follow offset words.
+
+    Each piece is scanned as if it began the document, so its first word
+    always opens both. Once it follows other text that is re-decided from
+    the word before it and the whitespace (gap) between the two.
+    """
+    sentences, paragraphs = piece.sentences, piece.paragraphs
+    if offset and piece.starts:
+        if PARAGRAPH_RE.search(gap) is None:
+            paragraphs = paragraphs[1:]
+            if not ends_sentence(prev_word): sentences = sentences[1:]
+    return array("I", (i + offset for i in sentences)), array("I", (i + offset for i in paragraphs))
+
+
+def dump_tokens(f, pieces):
+    """Writes consecutive TokenStore pieces (first based at 0) as one store.
+
+    Layout: magic, token count, text byte count, sentence and paragraph
+    counts, the starts / ends / orp columns and the boundary
+    indices in native byte order, then the UTF-8 text.
+    """
+    pieces = list(pieces)
+    count = sum(len(p) for p in pieces)
+    f.write(struct.pack("<8sQQQQ", TOKEN_CACHE_MAGIC, count, 0, 0, 0))
+    for name in ("starts", "ends", "orp"):
+        for p in pieces:
+            getattr(p, name).tofile(f)
+    n_bounds = [0, 0]
+    for k in (0, 1):
+        prev_word, gap, offset = "", "", 0
+        for p in pieces:
+            if p.starts:
+                bounds = _piece_boundaries(prev_word, gap + p.leading_text(), p, offset)[k]
+                bounds.tofile(f)
+                n_bounds[k] += len(bounds)
+                prev_word, gap = p.last_word(), ""
+            gap += p.trailing_text()
+            offset += len(p)
+    size = 0
+    for p in pieces:
+        for chunk in p.chunks:
+            data = chunk.encode("utf-8")
+            f.write(data)
+            size += len(data)
+    f.seek(0)
+    f.write(struct.pack("<8sQQQQ", TOKEN_CACHE_MAGIC, count, size, *n_bounds))
+
+
+def file_digest(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(block), b""):
+            h.update(data)
+    return h.hexdigest()
+
+
+def token_cache_path(digest):
+    return os.path.join(CACHE_DIR, digest + ".tok")
+
+
+def load_token_cache(digest):
+    """The cached TokenStore for a content hash, or None"""
+    try:
+        with open(token_cache_path(digest), "rb") as f:
+            return TokenStore.load(f)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return None
+
+
+def save_token_cache(digest, pieces):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = token_cache_path(digest)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        dump_tokens(f, pieces)
+    os.replace(tmp, path)  # Readers never see a half-written cache
+
+
+class StreamingLoader:
+    """Reads and tokenizes a text file on a worker thread, chunk by chunk.
+
+    Each chunk is decoded, cut at the last whitespace so no word is split,
+    and turned into a TokenStore piece with global offsets. The Tk thread
+    drains `queue` and only has to append the ready-made pieces.
+
+    With a known content digest a cached token index is served instead.
+    Otherwise the file is hashed while it streams (reading never waits for
+    the hash) and the index is cached for next time. "done" carries the
+    digest.
+    """
+    CHUNK_BYTES = 1 << 20
+
+    def __init__(self, path, digest=None):
+        self.path = path
+        self.digest = digest
+        self.total_bytes = os.path.getsize(path)
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _run(self):
+        try:
+            cached = load_token_cache(self.digest) if self.digest else None
+            if cached is not None:
+                self.queue.put(("chunk", cached, 1.0))
+                self.queue.put(("done", self.digest, 1.0))
+                return
+            self._stream()
+        except Exception as e:
+            self.queue.put(("error", str(e), 1.0))
+
+    def _stream(self):
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        hasher = hashlib.sha256()
+        pieces = []
+        carry = ""
+        offset = 0
+        done_bytes = 0
+        with open(self.path, "rb") as f:
+            while not self.cancelled.is_set():
+                raw = f.read(self.CHUNK_BYTES)
+                hasher.update(raw)
+                done_bytes += len(raw)
+                final = not raw
+                text = carry + decoder.decode(raw, final=final)
+                carry = ""
+                if not final:
+                    # Hold back a trailing partial word for the next chunk
+                    cut = len(text)
+                    while cut and not text[cut - 1].isspace():
+                        cut -= 1
+                    text, carry = text[:cut], text[cut:]
+                if text:
+                    piece = TokenStore(text, base=offset)
+                    pieces.append(piece)
+                    self.queue.put(("chunk", piece, done_bytes / max(1, self.total_bytes)))
+                    offset += len(text)
+                if final: break
+        if self.cancelled.is_set(): return
+
+        digest = hasher.hexdigest()
+        if not os.path.exists(token_cache_path(digest)):
+            save_token_cache(digest, pieces)
+        self.queue.put(("done", digest, 1.0))
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+
+class StreamReader:
+    """Follows stdin or a growing file on a worker thread.
+
+    Text is queued as ("text", str, None) as soon as it arrives, cut at the
+    last whitespace so no word is split. Tokenizing is left to the consumer
+    (see StreamRing), whose offsets move as it trims. A followed file starts
+    at its current end, like `tail -f`, and is read from the top again if
+    it is truncated or replaced (log rotation). Only stdin ever ends: "done"
+    at EOF.
+
+    The queue holds at most MAX_PENDING chunks. When the reader falls behind
+    a fast producer the thread blocks, so the backlog stays in the pipe (or
+    the file) instead of in memory.
+    """
+    CHUNK_BYTES = 1 << 16
+    MAX_PENDING = 16  # About 1 MB of text waiting to be tokenized
+    POLL_S = 0.2
+
+    def __init__(self, path=None):
+        self.path = None if path in (None, "-") else path  # None: stdin
+        self.name = os.path.basename(self.path) if self.path else "stdin"
+        self.queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self._decoder = None
+        self._carry = ""
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def _run(self):
+        try:
+            if self.path:
+                self._follow()
+            else:
+                self._pipe()
+        except Exception as e:
+            self._put(("error", str(e), None))
+
+    def _put(self, message):
+        # Backpressure: wait for room, but give up as soon as we're cancelled
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(message, timeout=self.POLL_S)
+                return
+            except queue.Full:
+                continue
+
+    def _feed(self, raw, final=False):
+        text = self._carry + self._decoder.decode(raw, final=final)
+        cut = len(text)
+        if not final:
+            while cut and not text[cut - 1].isspace():
+                cut -= 1
+            if not cut and len(text) >= self.CHUNK_BYTES:
+                cut = len(text)  # No whitespace at all: don't hold it forever
+        self._carry = text[cut:]
+        if cut:
+            self._put(("text", text[:cut], None))
+
+    def _pipe(self):
+        if sys.stdin is None:
+            raise OSError("no standard input to read from")
+        fd = sys.stdin.fileno()
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        while not self.cancelled.is_set():
+            raw = os.read(fd, self.CHUNK_BYTES)  # Returns whatever the producer has written
+            self._feed(raw, final=not raw)
+            if not raw: break
+        self._put(("done", None, 1.0))
+
+    def _follow(self):
+        f = open(self.path, "rb")
+        f.seek(0, os.SEEK_END)
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            while not self.cancelled.is_set():
+                raw = f.read(self.CHUNK_BYTES)
+                if raw:
+                    self._feed(raw)
+                    continue
+                self.cancelled.wait(self.POLL_S)
+                try:
+                    st = os.stat(self.path)
+                except OSError:
+                    continue  # Mid-rotation: the new file isn't there yet
+                if st.st_size < f.tell() or st.st_ino != os.fstat(f.fileno()).st_ino:
+                    self._feed(b"", final=True)
+                    f.close()
+                    f = open(self.path, "rb")
+                    self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        finally:
+            f.close()
+
+
+class StreamRing:
+    """A live stream's most recent words, in a TokenStore of bounded size.
+
+    feed() tokenizes new text onto the end. Once the store holds twice
+    `capacity` words, trim() drops all but the newest `capacity` in one
+    go, so trimming costs O(1) per word and memory stays flat however long
+    the stream runs. Word indices shift down by the count trim() returns.
+    """
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.store = TokenStore()
+        self.dropped = 0  # Words trimmed so far
+
+    def feed(self, text):
+        self.store.append(TokenStore(text, base=self.store.char_count()))
+
+    def trim(self):
+        excess = len(self.store) - self.capacity
+        if excess < self.capacity: return 0
+        self.store = self.store.tail(excess)
+        self.dropped += excess
+        return excess
+
+
+# =============================================================================
+#  EBOOK / PDF INGESTION
+# =============================================================================
+INGEST_EXTENSIONS = (".epub", ".pdf")
+
+
+class _HTMLText(HTMLParser):
+    """Flattens (X)HTML to text, with blank lines between block elements"""
+    BLOCK_TAGS = {"p", "div", "br", "li", "tr", "blockquote", "section",
+                  "h1", "h2", "h3", "h4", "h5", "h6"}
+    SKIP_TAGS = {"head", "script", "style"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(markup):
+    parser = _HTMLText()
+    parser.feed(markup)
+    parser.close()
+    return "".join(parser.parts)
+
+
+def iter_epub_chapters(path):
+    """Yields (text, done, total) for each spine document, in reading order"""
+    ns = {"c": "urn:oasis:names:tc:opendocument:xmlns:container",
+          "opf": "http://www.idpf.org/2007/opf"}
+    with zipfile.ZipFile(path) as z:
+        container = ET.fromstring(z.read("META-INF/container.xml"))
+        opf_path = container.find(".//c:rootfile", ns).get("full-path")
+        opf = ET.fromstring(z.read(opf_path))
+        base = posixpath.dirname(opf_path)
+        manifest = {item.get("id"): item.get("href") for item in opf.iterfind("opf:manifest/opf:item", ns)}
+        spine = [manifest[ref.get("idref")] for ref in opf.iterfind("opf:spine/opf:itemref", ns)
+                 if ref.get("idref") in manifest]
+        for i, href in enumerate(spine):
+            name = posixpath.normpath(posixpath.join(base, unquote(href)))
+            yield html_to_text(z.read(name).decode("utf-8", "replace")), i + 1, len(spine)
+
+
+def iter_pdf_pages(path):
+    """Yields (text, done, total) per page. Needs the optional pypdf package"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("PDF support needs the optional 'pypdf' package:\npip install pypdf")
+    reader = PdfReader(path)
+    total = len(reader.pages)
+    for i, page in enumerate(reader.pages):
+        yield page.extract_text() or "", i + 1, total
+
+
+def iter_book_pieces(path):
+    """(piece, fraction done) per chapter/page, as consecutive TokenStores"""
+    extract = iter_pdf_pages if path.lower().endswith(".pdf") else iter_epub_chapters
+    offset = 0
+    for text, done, total in extract(path):
+        # Blank line after every chapter/page so they never run together
+        piece = TokenStore(text + "\n\n", base=offset)
+        offset = piece.char_count()
+        yield piece, done / total
+
+
+def _ingest_worker(path, digest, out):
+    """Worker process: serve from the token cache or extract + tokenize"""
+    try:
+        digest = digest or file_digest(path)
+        cached = load_token_cache(digest)
+        if cached is not None:
+            out.put(("chunk", cached, 1.0))
+            out.put(("done", digest, 1.0))
+            return
+
+        pieces = []
+        for piece, progress in iter_book_pieces(path):
+            pieces.append(piece)
+            out.put(("chunk", piece, progress))
+        save_token_cache(digest, pieces)
+        out.put(("done", digest, 1.0))
+    except Exception as e:
+        out.put(("error", f"{type(e).__name__}: {e}", 1.0))
+
+
+class IngestLoader:
+    """Extracts an EPUB/PDF in a separate process, chapter by chapter.
+
+    Speaks the same queue protocol as StreamingLoader, so the UI can start
+    reading the first chapter while the rest of the book is parsed.
+    """
+    def __init__(self, path, digest=None):
+        ctx = multiprocessing.get_context("spawn")  # Never fork a Tk process
+        self.path = path
+        self.queue = ctx.Queue()
+        self.process = ctx.Process(target=_ingest_worker, args=(path, digest, self.queue), daemon=True)
+
+    def start(self):
+        self.process.start()
+
+    def cancel(self):
+        if self.process.is_alive():
+            self.process.terminate()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+
+def open_loader(path, digest=None):
+    """The background loader for path: a worker process for books, a thread otherwise"""
+    if path.lower().endswith(INGEST_EXTENSIONS):
+        return IngestLoader(path, digest)
+    return StreamingLoader(path, digest)
+
+
+# =============================================================================
+#  READING QUEUE
+# =============================================================================
+class _QueuedDocument:
+    __slots__ = ("path", "loader", "store", "digest", "error", "engine")
+
+    def __init__(self, path, loader, rules=None):
+        self.path = path
+        self.loader = loader
+        self.store = TokenStore()
+        self.digest = None
+        self.error = None
+        self.engine = ReadingEngine(self.store, rules=rules)  # Paces it ahead of time
+
+    @property
+    def ready(self):
+        return self.loader is None and self.error is None
+
+
+class ReadingQueue:
+    """Documents to read next, tokenized in the background while one plays.
+
+    Only the first `prefetch` entries are ever loaded, so memory holds at
+    most that many documents beyond the current one. poll() drains the
+    loaders and paces what they loaded with `rules`, a few milliseconds at
+    a time; pop() hands over the head.
+    """
+    PACE_BATCH = 2000  # Words paced per step, about a millisecond
+
+    def __init__(self, prefetch=1, digest_for=None, rules=None):
+        self.prefetch = prefetch
+        self.digest_for = digest_for
+        self.rules = rules  # The reader's, so the factors carry over
+        self.paths = []
+        self._jobs = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def add(self, path):
+        self.paths.append(path)
+
+    def remove(self, path):
+        if path in self.paths:
+            self.paths.remove(path)
+            self._drop(path)
+
+    def clear(self):
+        for path in list(self._jobs):
+            self._drop(path)
+        self.paths = []
+
+    def _drop(self, path):
+        job = self._jobs.pop(path, None)
+        if job is not None and job.loader is not None:
+            job.loader.cancel()
+
+    def status(self, path):
+        """"ready", "loading", "error" or None (not prefetched yet)"""
+        job = self._jobs.get(path)
+        if job is None: return None
+        if job.error is not None: return "error"
+        return "ready" if job.loader is None else "loading"
+
+    def poll(self, budget_s=0.005):
+        """Starts and drains the prefetch loaders; True while any is still busy"""
+        for path in self.paths[:self.prefetch]:
+            if path not in self._jobs:
+                digest = self.digest_for(path) if self.digest_for else None
+                try:
+                    loader = open_loader(path, digest)
+                except OSError as e:
+                    job = self._jobs[path] = _QueuedDocument(path, None, self.rules)
+                    job.error = str(e)
+                    continue
+                self._jobs[path] = _QueuedDocument(path, loader, self.rules)
+                loader.start()
+
+        deadline = time.perf_counter() + budget_s
+        busy = False
+        for job in self._jobs.values():
+            loader = job.loader
+            if loader is None: continue
+            try:
+                while time.perf_counter() < deadline:
+                    kind, payload, _ = loader.queue.get_nowait()
+                    if kind == "chunk":
+                        job.store.append(payload)
+                        continue
+                    if kind == "done":
+                        job.digest = payload
+                    else:
+                        job.error = payload
+                    job.loader = None
+                    break
+            except queue.Empty:
+                if not loader.is_alive() and loader.queue.empty():
+                    job.error = "The loader stopped unexpectedly"
+                    job.loader = None
+            busy = busy or job.loader is not None
+
+        for job in self._jobs.values():
+            if job.error is not None: continue
+            if self.rules is not None:
+                job.engine.set_rules(self.rules)
+            paced = False
+            while not paced and time.perf_counter() < deadline:
+                paced = job.engine.pace(self.PACE_BATCH)
+            busy = busy or not paced
+        return busy
+
+    def pop(self):
+        """Removes the head: (path, store, digest, engine), store None unless
+        fully loaded. The engine holds whatever pacing is done, for
+        ReadingEngine.take_pacing()."""
+        path = self.paths.pop(0)
+        job = self._jobs.pop(path, None)
+        if job is None or not job.ready:
+            if job is not None and job.loader is not None:
+                job.loader.cancel()
+            return path, None, None, None
+        return path, job.store, job.digest, job.engine
+
+
+# =============================================================================
+#  READING SESSIONS
+# =============================================================================
+class SessionStore:
+    """Saved settings and per-document reading state (sessions.json).
+
+    Documents are keyed by content hash, so a renamed or moved book still
+    resumes. A path -> (size, mtime, digest) memo lets a reopen skip hashing
+    the file. The update methods only touch memory. flush() serializes a
+    snapshot and writes it on a background thread.
+    """
+    def __init__(self, path=SESSIONS_PATH):
+        self.path = path
+        self.data = {"settings": {}, "documents": {}, "files": {}, "last": None}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.data.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        self._dirty = False
+        self._seq = 0
+        self._written = 0
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self):
+        return self.data["settings"]
+
+    def document(self, digest):
+        return self.data["documents"].get(digest) if digest else None
+
+    def last_document(self):
+        return self.document(self.data.get("last"))
+
+    def update_settings(self, **settings):
+        self.data["settings"].update(settings)
+        self._dirty = True
+
+    def update_document(self, digest, **state):
+        docs = self.data["documents"]
+        doc = docs.pop(digest, {})  # Re-insert: dict order doubles as LRU order
+        doc.update(state, saved=time.time())
+        docs[digest] = doc
+        while len(docs) > MAX_SAVED_DOCUMENTS:
+            del docs[next(iter(docs))]
+        self.data["last"] = digest
+        self._dirty = True
+
+    def digest_for(self, path):
+        """Content hash remembered for path, if the file is unchanged"""
+        memo = self.data["files"].get(os.path.abspath(path))
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if memo and memo["size"] == st.st_size and memo["mtime"] == st.st_mtime:
+            return memo["digest"]
+        return None
+
+    def remember_file(self, path, digest):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self.data["files"][os.path.abspath(path)] = {
+            "size": st.st_size, "mtime": st.st_mtime, "digest": digest}
+        self._dirty = True
+
+    def flush(self, wait=False):
+        if not self._dirty: return
+        self._dirty = False
+        self._seq += 1
+        snapshot = json.dumps(self.data)
+        if wait:
+            self._write(self._seq, snapshot)
+        else:
+            threading.Thread(target=self._write, args=(self._seq, snapshot), daemon=True).start()
+
+    def _write(self, seq, snapshot):
+        with self._lock:
+            if seq <= self._written: return  # A newer snapshot already landed
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(snapshot)
+                os.replace(tmp, self.path)
+                self._written = seq
+            except OSError:
+                pass  # Saving progress is best effort, never fatal
+
+
+def load_font_list(path=FONTS_PATH):
+    """Font families cached by an earlier session, or None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            families = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return families if isinstance(families, list) else None
+
+
+def save_font_list(families, path=FONTS_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(families, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Only a cache
+
+
+# =============================================================================
+#  READING LOG
+# =============================================================================
+class ReadingLog:
+    """Optional append-only reading analytics (reading_log.jsonl).
+
+    Recording only appends to an in-memory buffer, so the reading loop never
+    touches the disk. flush() hands the batch to a single writer thread that
+    appends it as JSON lines, one event each: {"t": unix time, "e": kind, ...}.
+
+    A session runs from start to stop (pause, end, close or switching
+    documents); its stop event carries the words read, the time and so the
+    effective WPM. Seeks and WPM changes made while reading carry its id.
+    """
+    WPM_COALESCE_S = 1.0  # WPM changes closer together than this are one slider drag
+
+    def __init__(self, path=READING_LOG_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.buffer = []
+        self.session = None  # Start event of the open session
+        self._batches = queue.Queue()
+        self._writer = None
+
+    def record(self, kind, **fields):
+        if not self.enabled: return
+        now = round(time.time(), 3)
+        last = self.buffer[-1] if self.buffer else None
+        if (kind == "wpm" and last is not None and last["e"] == "wpm"
+                and last["s"] == fields.get("s") and now - last["t"] < self.WPM_COALESCE_S):
+            self.buffer.pop()  # One slider drag is one change
+        event = {"t": now, "e": kind}
+        event.update(fields)
+        self.buffer.append(event)
+        return event
+
+    def _session_id(self):
+        return self.session["s"] if self.session else None
+
+    def start(self, doc, path, index, wpm, chunk_size=1):
+        self.stop("restart", index)  # Never leave one open
+        self.session = self.record("start", s=int(time.time() * 1000), doc=doc, path=path,
+                                   at=index, wpm=wpm, chunk=chunk_size)
+
+    def stop(self, reason, index, scheduler=None):
+        """Closes the open session; the scheduler supplies words and time read"""
+        session, self.session = self.session, None
+        if session is None or not self.enabled: return
+        words = ms = 0
+        if scheduler is not None:
+            words = scheduler.shown + scheduler.skipped
+            ms = round(scheduler.clock.now() - scheduler.started_at)
+        self.record("stop", s=session["s"], doc=session["doc"], path=session["path"],
+                    reason=reason, at=session["at"], to=index, words=words, ms=ms,
+                    wpm=session["wpm"], chunk=session["chunk"])
+
+    def seek(self, start, end):
+        if start != end:
+            self.record("seek", s=self._session_id(), at=start, to=end)
+
+    def wpm(self, wpm):
+        self.record("wpm", s=self._session_id(), wpm=wpm)
+
+    def flush(self, wait=False):
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self._batches.put(batch)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_batches, daemon=True)
+                self._writer.start()
+        if wait and self._writer is not None:
+            self._batches.join()
+
+    def _write_batches(self):
+        # One writer, so batches land in the order they were recorded
+        while True:
+            batch = self._batches.get()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in batch))
+            except OSError:
+                pass  # Analytics are best effort, never fatal
+            finally:
+                self._batches.task_done()
+
+    def events(self):
+        """Every logged event, oldest first (pending ones are flushed first)"""
+        self.flush(wait=True)
+        try:
+            f = open(self.path, encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Torn last line after a crash
+
+    def sessions(self):
+        """Finished sessions (their stop events), with regressions and WPM changes counted"""
+        counts = {}
+        for event in self.events():
+            kind = event.get("e")
+            if kind == "stop":
+                event["regressions"], event["wpm_changes"] = counts.pop(event["s"], (0, 0))
+                yield event
+            elif event.get("s") is not None and kind in ("seek", "wpm"):
+                back, changes = counts.get(event["s"], (0, 0))
+                if kind == "wpm":
+                    changes += 1
+                elif event["to"] < event["at"]:
+                    back += 1
+                counts[event["s"]] = (back, changes)
+
+    def summary(self, days=7):
+        """Totals over every session, plus the last `days` days that had reading"""
+        total = {"sessions": 0, "words": 0, "minutes": 0.0, "regressions": 0, "wpm_changes": 0}
+        by_day = {}
+        for event in self.sessions():
+            day = time.strftime("%Y-%m-%d", time.localtime(event["t"]))
+            row = by_day.get(day)
+            if row is None:
+                row = by_day[day] = {"sessions": 0, "words": 0, "minutes": 0.0}
+            minutes = event["ms"] / 60000
+            for agg in (total, row):
+                agg["sessions"] += 1
+                agg["words"] += event["words"]
+                agg["minutes"] += minutes
+            total["regressions"] += event["regressions"]
+            total["wpm_changes"] += event["wpm_changes"]
+        for agg in (total, *by_day.values()):
+            agg["effective_wpm"] = agg["words"] / agg["minutes"] if agg["minutes"] > 0 else 0.0
+        total["days"] = [dict(day=day, **by_day[day]) for day in sorted(by_day)[-days:]]
+        return total
+
+    EXPORT_FIELDS = ("started", "path", "reason", "from", "to", "words", "minutes",
+                     "wpm", "effective_wpm", "regressions", "wpm_changes")
+
+    def export(self, path):
+        """Writes one row per session as CSV, or JSON when path ends in .json"""
+        rows = []
+        for e in self.sessions():
+            minutes = e["ms"] / 60000
+            started = e["t"] - e["ms"] / 1000
+            rows.append((time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+                         e["path"] or "", e["reason"], e["at"], e["to"], e["words"],
+                         round(minutes, 2), e["wpm"],
+                         round(e["words"] / minutes) if minutes > 0 else 0,
+                         e["regressions"], e["wpm_changes"]))
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fields": self.EXPORT_FIELDS, "rows": rows}, f)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.EXPORT_FIELDS)
+                writer.writerows(rows)
+
+
+# =============================================================================
+#  PACING MODEL
+# =============================================================================
+WORD_FREQUENCY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_frequency.txt")
+PACING_RULES_PATH = os.path.join(GLANCE_HOME, "pacing.json")
+_word_ranks = None
+
+
+def word_ranks():
+    """The bundled frequency table as {word: rank}, loaded on first use"""
+    global _word_ranks
+    if _word_ranks is None:
+        try:
+            with open(WORD_FREQUENCY_PATH, encoding="utf-8") as f:
+                words = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        except OSError:
+            words = []
+        _word_ranks = {w: i for i, w in enumerate(words)}
+    return _word_ranks
+
+
+class PacingRules:
+    """How long each word stays up, as a multiple of the WPM slot.
+
+    A word's factor is the product of its punctuation class (the slowest
+    mark it ends with), a length curve, and a boost for rare words (not in
+    the first common_words of the frequency table) or numbers. The last
+    word of a paragraph is held `paragraph` times longer. Factors never
+    exceed max_factor and don't depend on WPM, which is applied on top.
+    """
+    DEFAULTS = {
+        "punctuation": {".!?\u2026": 2.0, ",;:": 1.5, "\u2013\u2014": 1.3},
+        "length_from": 8,  # Letters before the length curve starts
+        "length_step": 0.05,  # Extra time per letter past length_from
+        "length_max": 1.5,
+        "rare": 1.25,
+        "common_words": 1000,
+        "number": 1.3,
+        "paragraph": 2.0,
+        "max_factor": 4.0,
+    }
+
+    def __init__(self, **rules):
+        unknown = set(rules) - set(self.DEFAULTS)
+        if unknown: raise ValueError(f"Unknown pacing rules: {', '.join(sorted(unknown))}")
+        self.config = dict(self.DEFAULTS, **rules)
+        punctuation = self.config.pop("punctuation")
+        if not isinstance(punctuation, dict) or not all(isinstance(marks, str) for marks in punctuation):
+            raise ValueError("punctuation must map marks to factors")
+        bad = [name for name, value in [*self.config.items(), *punctuation.items()]
+               if isinstance(value, bool) or not isinstance(value, (int, float))]
+        if bad: raise ValueError(f"Pacing rules must be numbers: {', '.join(bad)}")
+        self.config["punctuation"] = punctuation
+        self._punctuation = [(frozenset(marks), factor)
+                             for marks, factor in self.config["punctuation"].items()]
+
+    @classmethod
+    def load(cls, path=PACING_RULES_PATH):
+        """Rules from a JSON file of overrides; defaults if it's missing, broken
+        or sets anything to the wrong type"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def __eq__(self, other):
+        return isinstance(other, PacingRules) and self.config == other.config
+
+    def word_factor(self, word):
+        c = self.config
+        tail = word[-2:]  # The mark may sit before a closing quote or bracket
+        factor = max((f for marks, f in self._punctuation if not marks.isdisjoint(tail)), default=1.0)
+        core = search_key(word).replace("\u2019", "'")
+        factor *= min(1.0 + c["length_step"] * max(0, len(core) - c["length_from"]), c["length_max"])
+        if any(ch.isdigit() for ch in core):
+            factor *= c["number"]
+        elif core.isalpha() and word_ranks().get(core, c["common_words"]) >= c["common_words"]:
+            factor *= c["rare"]
+        return min(factor, c["max_factor"])
+
+    def compute(self, store, start=0, end=None):
+        """Factors for store's words [start, end), in one batch pass.
+
+        Each distinct word is scored once; the per-word lookups run in C
+        via map(), and paragraph pauses are then applied by position.
+        """
+        end = len(store) if end is None else min(end, len(store))
+        words = store.words(start, end)
+        table = {w: self.word_factor(w) for w in set(words)}
+        factors = array("f", map(table.__getitem__, words))
+        pause, cap = self.config["paragraph"], self.config["max_factor"]
+        bounds = store.paragraphs
+        for p in bounds[bisect_right(bounds, start):bisect_right(bounds, min(end, len(store) - 1))]:
+            factors[p - 1 - start] = min(factors[p - 1 - start] * pause, cap)
+        return factors
+
+
+# =============================================================================
+#  LIBRARY IMPORT
+# =============================================================================
+LIBRARY_EXTENSIONS = (".txt",) + INGEST_EXTENSIONS
+
+
+def _import_worker(path, known):
+    """Pool worker: hash one file, tokenize it into the token cache, count it.
+
+    `known` is the file's previous manifest entry; if the content hash still
+    matches and its cache exists, nothing is re-tokenized.
+    """
+    st = os.stat(path)
+    if path.lower().endswith(INGEST_EXTENSIONS):
+        digest, raw = file_digest(path), None
+    else:
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+    entry = {"size": st.st_size, "mtime": st.st_mtime, "digest": digest}
+    cached = os.path.exists(token_cache_path(digest))
+    if known and known.get("digest") == digest and cached:
+        return dict(known, **entry)
+
+    store = load_token_cache(digest) if cached else None
+    if store is None:
+        if raw is None:
+            pieces = [piece for piece, _ in iter_book_pieces(path)]
+        else:
+            pieces = [TokenStore(raw.decode("utf-8"))]
+        save_token_cache(digest, pieces)
+        store = TokenStore()
+        for piece in pieces:
+            store.append(piece)
+    # Pacing-weighted length: reading time at any WPM is paced / wpm minutes
+    entry.update(words=len(store), sentences=len(store.sentences), paragraphs=len(store.paragraphs),
+                 paced=round(sum(PacingRules.load().compute(store)), 1))
+    return entry
+
+
+class Library:
+    """Imported folders of documents (library.json).
+
+    import_folder() tokenizes every readable file under a folder on a pool
+    of processes, one file per task, straight into the token cache, so any
+    of them opens from the cache later. The manifest keeps each file's size,
+    mtime, content hash, word/sentence/paragraph counts and pacing-weighted
+    length. Re-imports skip files whose size and mtime are unchanged without
+    reading them; changed ones are hashed and only re-tokenized if the
+    content differs.
+    """
+    def __init__(self, path=LIBRARY_PATH):
+        self.path = path
+        self.data = {"files": {}}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.data.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def files(self):
+        return self.data["files"]
+
+    def __len__(self):
+        return len(self.files)
+
+    def entry(self, path):
+        return self.files.get(os.path.abspath(path))
+
+    def digest_for(self, path):
+        """Content hash of an imported file, if it is unchanged since"""
+        entry = self.entry(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            return entry["digest"]
+        return None
+
+    def import_folder(self, folder, workers=None, progress=None, cancelled=None):
+        """Imports (or refreshes) every readable file under folder.
+
+        progress(done, total) is called from this thread after each file;
+        setting the `cancelled` Event stops before the next one. Returns
+        counts: files, imported, unchanged, removed, and errors as
+        [(path, message)]. The manifest is saved as it goes.
+
+        The work happens on a copy of the manifest that replaces it at the
+        end, so another thread may read the library meanwhile.
+        """
+        folder = os.path.abspath(folder)
+        found = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                if name.lower().endswith(LIBRARY_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        found[path] = os.stat(path)
+                    except OSError:
+                        continue
+
+        files = dict(self.files)
+        prefix = os.path.join(folder, "")
+        removed = [p for p in files if p.startswith(prefix) and p not in found]
+        for path in removed:
+            del files[path]
+
+        todo = []
+        for path, st in found.items():
+            known = files.get(path)
+            if (known and known["size"] == st.st_size and known["mtime"] == st.st_mtime
+                    and os.path.exists(token_cache_path(known["digest"]))):
+                continue
+            todo.append((path, known))
+
+        result = {"files": len(found), "imported": 0, "unchanged": len(found) - len(todo),
+                  "removed": len(removed), "errors": []}
+        if todo:
+            self._run_pool(files, todo, workers, progress, cancelled, result)
+        self.data["files"] = files
+        self.save()
+        return result
+
+    def _run_pool(self, files, todo, workers, progress, cancelled, result):
+        ctx = multiprocessing.get_context("spawn")  # Never fork a Tk process
+        workers = min(len(todo), workers or os.cpu_count() or 1)
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {pool.submit(_import_worker, path, known): (path, known) for path, known in todo}
+            for future in as_completed(futures):
+                path, known = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    result["errors"].append((path, f"{type(e).__name__}: {e}"))
+                else:
+                    if known and known.get("digest") == entry["digest"]:
+                        result["unchanged"] += 1  # Only touched
+                    else:
+                        result["imported"] += 1
+                    files[path] = entry
+                done += 1
+                if progress is not None:
+                    progress(done, len(todo))
+                if done % 50 == 0:
+                    self.save(files)  # Don't lose a long import to a crash
+                if cancelled is not None and cancelled.is_set():
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    break
+
+    def save(self, files=None):
+        """Writes the manifest, or `files` in place of its file entries"""
+        data = self.data if files is None else dict(self.data, files=files)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # The token cache itself is intact; the next import redoes the manifest
+
+    def summary(self, wpm):
+        """(documents, words, minutes at wpm) over the whole library"""
+        files = self.files.values()
+        words = sum(e["words"] for e in files)
+        return len(self.files), words, sum(e["paced"] for e in files) / max(1, wpm)
+
+
+# =============================================================================
+#  PACING CLOCK & SCHEDULER
+# =============================================================================
+class MonotonicClock:
+    """Real time source in milliseconds, immune to wall-clock adjustments"""
+    def now(self):
+        return time.perf_counter() * 1000.0
+
+
+class VirtualClock:
+    """Manually advanced clock so pacing can be replayed deterministically"""
+    def __init__(self, start=0.0):
+        self.t = float(start)
+
+    def now(self):
+        return self.t
+
+    def advance(self, ms):
+        self.t += ms
+
+
+class WordScheduler:
+    """Pins every word to an absolute deadline instead of chaining delays.
+
+    Render time and timer slop only shorten the next wait, so they never
+    accumulate. A flash may hold several words; counts are always in words.
+    If a word's whole slot is already gone it is skipped, and a stall longer
+    than max_lag_ms (window drag, sleep) re-anchors the timeline instead of
+    flashing through the backlog.
+    """
+    def __init__(self, clock=None, max_lag_ms=500, skip_late=True):
+        self.clock = clock or MonotonicClock()
+        self.max_lag_ms = max_lag_ms
+        self.skip_late = skip_late
+        self.start()
+
+    def start(self):
+        now = self.clock.now()
+        self.deadline = now
+        self.started_at = now
+        self.scheduled_ms = 0.0
+        self.shown = 0
+        self.skipped = 0
+        self.resyncs = 0
+
+    def should_skip(self, delay_ms, words=1):
+        """True (and the slot is consumed) if this flash's slot already passed"""
+        late = self.clock.now() - self.deadline
+        if late > self.max_lag_ms:
+            # Stalled: resync and keep the stall out of the pacing stats
+            self.deadline += late
+            self.started_at += late
+            self.resyncs += 1
+            return False
+        if self.skip_late and late >= delay_ms:
+            self.deadline += delay_ms
+            self.scheduled_ms += delay_ms
+            self.skipped += words
+            return True
+        return False
+
+    def resync(self):
+        """Re-anchors on now after a deliberate wait (e.g. for more text)"""
+        gap = self.clock.now() - self.deadline
+        if gap > 0:
+            self.deadline += gap
+            self.started_at += gap
+
+    def commit(self, delay_ms, words=1):
+        """Books the flash just shown, returns ms to wait for the next deadline"""
+        self.deadline += delay_ms
+        self.scheduled_ms += delay_ms
+        self.shown += words
+        return max(0, int(round(self.deadline - self.clock.now())))
+
+    def achieved_wpm(self):
+        elapsed = self.clock.now() - self.started_at
+        if elapsed <= 0: return 0.0
+        return (self.shown + self.skipped) * 60000.0 / elapsed
+
+    def requested_wpm(self):
+        if self.scheduled_ms <= 0: return 0.0
+        return (self.shown + self.skipped) * 60000.0 / self.scheduled_ms
+
+    def summary(self):
+        text = f"Achieved {self.achieved_wpm():.0f} WPM (scheduled {self.requested_wpm():.0f})"
+        if self.skipped:
+            text += f" | {self.skipped} skipped"
+        return text
+
+
+# =============================================================================
+#  SEARCH
+# =============================================================================
+SEARCH_STRIP = string.punctuation + "\u2018\u2019\u201c\u201d\u00ab\u00bb\u2013\u2014\u2026"
+
+
+def search_key(word):
+    """How a word is indexed and looked up: no case, no outer punctuation"""
+    return word.lower().strip(SEARCH_STRIP)
+
+
+def _index_key(word):
+    # A dash or ellipsis standing alone keeps its own text, so phrases copied
+    # across one still line up word for word
+    return search_key(word) or word
+
+
+class SearchIndex:
+    """Inverted index over a TokenStore: search key -> word indices.
+
+    Postings are uint32 arrays in reading order. extend() indexes a bounded
+    number of words per call, so a front end can build the index in small
+    slices while a book loads. find() takes one word or a phrase.
+    """
+    def __init__(self):
+        self.generation = 0
+        self.reset()
+
+    def reset(self, store=None):
+        """Forgets everything; call after a store is edited in place"""
+        self.store = store
+        self.postings = {}
+        self.count = 0  # Words indexed so far
+        self.generation += 1
+
+    def pending(self, store):
+        return store is not self.store or self.count < len(store)
+
+    def extend(self, store, limit=None):
+        """Indexes up to `limit` more words of store (all by default)"""
+        if store is not self.store: self.reset(store)
+        end = len(store) if limit is None else min(len(store), self.count + limit)
+        postings = self.postings
+        for k, word in enumerate(store.words(self.count, end), self.count):
+            key = _index_key(word)
+            hits = postings.get(key)
+            if hits is None:
+                hits = postings[key] = array("I")
+            hits.append(k)
+        self.count = end
+
+    def find(self, query):
+        """Indices of the words where the phrase starts, in reading order"""
+        keys = [_index_key(w) for w in query.split()]
+        lists = [self.postings.get(k) for k in keys]
+        if not lists or None in lists: return array("I")
+        if len(lists) == 1: return array("I", lists[0])
+        # Walk the rarest word's hits; the others must sit right beside it
+        pivot = min(range(len(lists)), key=lambda j: len(lists[j]))
+        found = array("I")
+        for p in lists[pivot]:
+            start = p - pivot
+            if start < 0: continue
+            for j, hits in enumerate(lists):
+                x = bisect_left(hits, start + j)
+                if x == len(hits) or hits[x] != start + j: break
+            else:
+                found.append(start)
+        return found
+
+
+# =============================================================================
+#  LAYOUT CACHE
+# =============================================================================
+class LayoutCache:
+    """Bounded LRU of word layouts for the current reader font.
+
+    A layout is (left, centre, right, left_w, centre_w, right_w): the ORP
+    split plus pixel widths. Entries are keyed by (family, size, word) and
+    the cache empties itself when set_font() switches font. `measure` is
+    any callable returning a text's width in pixels (e.g. Font.measure).
+    """
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.family = self.size = self.measure = None
+        self.hits = self.misses = 0
+
+    def set_font(self, family, size, measure):
+        if (family, size) != (self.family, self.size):
+            self._entries.clear()
+        self.family, self.size, self.measure = family, size, measure
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, word):
+        return (self.family, self.size, word) in self._entries
+
+    def get(self, word, orp_idx):
+        key = (self.family, self.size, word)
+        layout = self._entries.get(key)
+        if layout is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return layout
+        self.misses += 1
+        return self._put(key, word, orp_idx)
+
+    def prewarm(self, word, orp_idx):
+        """Measures a word ahead of time without counting a hit or miss"""
+        key = (self.family, self.size, word)
+        if key not in self._entries:
+            self._put(key, word, orp_idx)
+
+    def _put(self, key, word, orp_idx):
+        left, center, right = word[:orp_idx], word[orp_idx:orp_idx+1], word[orp_idx+1:]
+        measure = self.measure
+        layout = (left, center, right,
+                  measure(left) if left else 0, measure(center), measure(right) if right else 0)
+        self._entries[key] = layout
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return layout
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# =============================================================================
+#  INSTRUMENTATION
+# =============================================================================
+class FrameTrace:
+    """Per-word timing samples in a fixed-size ring buffer.
+
+    All times are scheduler-clock milliseconds. `scheduled` is the word's
+    deadline, `fired` when its timer callback ran, `displayed` when drawing
+    returned; draw/progress are the durations of those stages. status is
+    the time the status bar spent repainting since the previous sample: it
+    runs on its own timer, between words. Columns are preallocated, so
+    recording never allocates.
+    """
+    FIELDS = ("index", "scheduled", "fired", "displayed", "draw_ms", "progress_ms", "status_ms")
+
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.columns = [array("d", bytes(8 * capacity)) for _ in self.FIELDS]
+        self.count = 0  # Samples ever recorded; the buffer keeps the latest
+
+    def record(self, index, scheduled, fired, displayed, draw_ms, progress_ms, status_ms=0.0):
+        slot = self.count % self.capacity
+        for col, value in zip(self.columns, (index, scheduled, fired, displayed, draw_ms, progress_ms, status_ms)):
+            col[slot] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def rows(self, last=None):
+        """Samples oldest first, as tuples in FIELDS order"""
+        n = len(self) if last is None else min(last, len(self))
+        first = self.count - n
+        index_col, timing_cols = self.columns[0], self.columns[1:]
+        for i in range(first, self.count):
+            slot = i % self.capacity
+            yield (int(index_col[slot]),) + tuple(col[slot] for col in timing_cols)
+
+    def summary(self, last=120):
+        """Onset jitter and effective WPM over the most recent words"""
+        rows = list(self.rows(last))
+        if len(rows) < 2: return None
+        lateness = sorted(r[3] - r[1] for r in rows)
+        span = rows[-1][3] - rows[0][3]
+        return {
+            "jitter_ms": sum(abs(x) for x in lateness) / len(lateness),
+            "p95_late_ms": lateness[max(0, int(len(lateness) * 0.95) - 1)],
+            "effective_wpm": (len(rows) - 1) * 60000.0 / span if span > 0 else 0.0,
+            "draw_ms": sum(r[4] for r in rows) / len(rows),
+            "progress_ms": sum(r[5] for r in rows) / len(rows),
+            "status_ms": sum(r[6] for r in rows) / len(rows),
+        }
+
+    def export(self, path):
+        """Writes the buffer as CSV, or JSON when path ends in .json"""
+        names = self.FIELDS + ("late_ms",)
+        rows = [r + (r[3] - r[1],) for r in self.rows()]
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fields": names, "rows": rows, "dropped": self.count - len(rows)}, f)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(names)
+                writer.writerows(rows)
+
+
+# =============================================================================
+#  READING ENGINE
+# =============================================================================
+# Short words that lean on the next one, so a chunk shouldn't end on them
+FUNCTION_WORDS = frozenset(
+    "a an the of to in on at by for from with as and or but nor if so than that "
+    "is are was were be been his her its their our my your this these those "
+    "not no very into onto over under".split())
+PHRASE_END_CHARS = frozenset(",;:.!?")
+CHUNK_MAX_CHARS = 24
+
+
+def phrase_chunk_end(store, index, max_words, max_chars=CHUNK_MAX_CHARS):
+    """End (exclusive) of the phrase-sized chunk of words starting at index.
+
+    Takes up to max_words words but stops after punctuation, at a paragraph
+    break and before the chunk outgrows max_chars, then hands a dangling
+    function word ("the", "of") on to the next chunk, where it belongs.
+    """
+    count = len(store)
+    bounds = store.paragraphs
+    p = bisect_right(bounds, index)
+    if p < len(bounds):
+        count = bounds[p]  # A heading never runs into the next paragraph
+    end = index + 1
+    chars = len(store[index])
+    while end < count and end - index < max_words:
+        if PHRASE_END_CHARS.intersection(store[end - 1][-2:]): break
+        chars += 1 + len(store[end])
+        if chars > max_chars: break
+        end += 1
+    if end - index > 1 and end < count and store[end - 1].lower() in FUNCTION_WORDS:
+        end -= 1
+    return end
+
+
+class ReadingEngine:
+    """A document, a position and a pace, with no UI attached.
+
+    A front end drives it from its own timer: next_word() says which word
+    to show (skipping any whose slot already passed), and after drawing it
+    advance() books the word and returns how long to wait for the next.
+
+    With chunk_size > 1 each flash is a short phrase of up to that many
+    words, starting at the index next_word() returns; chunk() gives its
+    text. Positions, pacing and WPM all stay in words.
+
+    Per-word pacing factors come from `rules`, computed in batches: new
+    words as the store grows, the edited ones after a splice, everything
+    only when the rules change. A WPM change just rescales them. Their
+    prefix sums make the reading time between any two words, and so every
+    ETA, O(1).
+    """
+    def __init__(self, store=None, wpm=350, clock=None, chunk_size=1, rules=None):
+        self.store = store if store is not None else TokenStore()
+        self.index = 0
+        self.wpm = wpm
+        self.rules = rules or PacingRules()
+        self._factors = array("f")
+        self._prefix = array("d", [0.0])  # _prefix[i]: sum of the factors before word i
+        self._paced_for = None  # (store, store.version) the factors belong to
+        self.chunk_size = chunk_size
+        self.chunk_max_chars = CHUNK_MAX_CHARS  # A front end may fit this to its width
+        self.chunk_end = 0  # End of the chunk next_word() last returned
+        self.scheduler = WordScheduler(clock)
+
+    def set_rules(self, rules):
+        if rules != self.rules:
+            self.rules = rules
+            self._paced_for = None  # Recomputed on next use
+
+    def pace(self, limit=None):
+        """Paces up to `limit` more words now (all by default); True once
+        every word is, so a prefetch can spread the work over idle slices"""
+        self._pace(limit)
+        return len(self._factors) == len(self.store)
+
+    def take_pacing(self, other):
+        """Adopts the factors another engine computed for this store and rules"""
+        if other.store is self.store and other.rules == self.rules:
+            self._factors, self._prefix, self._paced_for = other._factors, other._prefix, other._paced_for
+
+    def _pace(self, limit=None):
+        """Brings the factors and their prefix sums up to date with the store"""
+        store = self.store
+        paced = self._paced_for
+        if paced is None or paced[0] is not store or not self._follow_edits(paced[1]):
+            self._factors = array("f")
+            self._prefix = array("d", [0.0])
+        self._paced_for = (store, store.version)
+        done = len(self._factors)
+        if done != len(store):
+            start = max(0, done - 1)  # Its paragraph pause depends on the word after it
+            del self._factors[start:]
+            del self._prefix[start + 1:]
+            added = self.rules.compute(store, start, None if limit is None else done + limit)
+            self._factors.extend(added)
+            sums = accumulate(added, initial=self._prefix[start])
+            next(sums)
+            self._prefix.extend(sums)
+
+    def _follow_edits(self, version):
+        """Patches the factors for the splices since `version`.
+
+        Each edit moves the factors after it along and leaves placeholders
+        for its new words; those, and the word before (its paragraph pause
+        may have changed) and after, are then computed from the final text,
+        and the prefix sums rebuilt from the first edit on. False if the
+        store's edit log no longer reaches back to `version`.
+        """
+        store = self.store
+        edits = [edit for edit in store.edits if edit[0] > version]
+        if len(edits) != store.version - version: return False
+        factors = self._factors
+        lo, hi = len(factors), 0  # Words to recompute, in current positions
+        for _, first, removed, added in edits:
+            if first + removed > len(factors):
+                # Reaches past what is paced: the catch-up in _pace() covers it
+                del factors[first:]
+                lo, hi = min(lo, len(factors)), min(hi, len(factors))
+                continue
+            factors[first:first + removed] = array("f", bytes(4 * added))
+            if hi > first:
+                hi = first + added if hi < first + removed else hi + added - removed
+            lo = min(lo, max(0, first - 1))
+            hi = max(hi, first + added + 1)
+        lo, hi = min(lo, len(factors)), min(hi, len(factors))
+        if lo < hi:
+            factors[lo:hi] = self.rules.compute(store, lo, hi)
+        del self._prefix[lo + 1:]
+        sums = accumulate(factors[lo:], initial=self._prefix[lo])
+        next(sums)
+        self._prefix.extend(sums)
+        return True
+
+    @property
+    def factors(self):
+        """Pacing factor of every word"""
+        self._pace()
+        return self._factors
+
+    @property
+    def prefix(self):
+        """Running totals of the factors, one longer than the store"""
+        self._pace()
+        return self._prefix
+
+    def delay_ms(self, index, end=None):
+        """Display time for the words index..end (one word by default)"""
+        if end is None: return (60000.0 / max(1, self.wpm)) * self.factors[index]
+        prefix = self.prefix
+        return (60000.0 / max(1, self.wpm)) * (prefix[end] - prefix[index])
+
+    def _chunk_end(self, index):
+        if self.chunk_size <= 1: return index + 1
+        return phrase_chunk_end(self.store, index, self.chunk_size, self.chunk_max_chars)
+
+    def chunk(self, index):
+        """(end, text, orp_idx) of the flash that starts at index"""
+        store = self.store
+        if self.chunk_size <= 1: return index + 1, store[index], store.orp[index]
+        end = self._chunk_end(index)
+        if end == index + 1: return end, store[index], store.orp[index]
+        text = " ".join(store[i] for i in range(index, end))
+        return end, text, chunk_orp_index(text)
+
+    def start(self, rewind=True):
+        """Starts the clock; rewinds to the top if we had finished.
+
+        Pass rewind=False while more text is still arriving (a loader or a
+        live stream): being at the end then only means caught up.
+        """
+        if rewind and self.index >= len(self.store):
+            self.index = 0
+        self.scheduler.start()
+
+    def seek(self, index):
+        count = len(self.store)
+        self.index = max(0, min(index, count - 1 if count else 0))
+        self.chunk_end = self.index
+        return self.index
+
+    def step(self, words):
+        return self.seek(self.index + words)
+
+    def seek_boundary(self, bounds, direction):
+        """Jumps to the next (+1) or previous (-1) entry of a boundary index.
+
+        Backwards goes to the start of the current sentence or paragraph
+        first, like a "back" button; both directions are a bisect.
+        """
+        if direction > 0:
+            i = bisect_right(bounds, self.index)
+            return self.seek(bounds[i]) if i < len(bounds) else self.index
+        i = bisect_left(bounds, self.index)
+        return self.seek(bounds[i - 1] if i else 0)
+
+    def seek_sentence(self, direction):
+        return self.seek_boundary(self.store.sentences, direction)
+
+    def seek_paragraph(self, direction):
+        return self.seek_boundary(self.store.paragraphs, direction)
+
+    def seek_fraction(self, fraction):
+        return self.seek(int(fraction * len(self.store)))
+
+    def at_end(self):
+        return self.index >= len(self.store)
+
+    def next_word(self):
+        """Index of the word (or chunk) due now, or None at the end of the store"""
+        count = len(self.store)
+        if self.index >= count: return None
+        end = self._chunk_end(self.index)
+        # Behind schedule: drop flashes whose whole slot has already passed
+        while end < count and self.scheduler.should_skip(self.delay_ms(self.index, end), end - self.index):
+            self.index = end
+            end = self._chunk_end(end)
+        self.chunk_end = end
+        return self.index
+
+    def advance(self):
+        """Books the flash just shown; returns ms until the next deadline"""
+        end = max(self.chunk_end, self.index + 1)
+        wait = self.scheduler.commit(self.delay_ms(self.index, end), end - self.index)
+        self.index = end
+        return wait
+
+    def minutes_at(self, index):
+        """Reading time from the start to word index at the current WPM"""
+        prefix = self.prefix
+        return prefix[max(0, min(index, len(prefix) - 1))] / max(1, self.wpm)
+
+    def total_minutes(self):
+        return self.minutes_at(len(self.store))
+
+    def remaining_minutes(self):
+        return self.total_minutes() - self.minutes_at(self.index)
+
+
+def format_minutes(minutes):
+    return f"{int(minutes)}m {int((minutes % 1) * 60)}s"
@@ -0,0 +1,304 @@
+"""
+Glance in a terminal.
+
+    python Glance.py --tui book.txt
+    python glance_tui.py book.epub --wpm 500 --chunk 2 --trace frames.csv
+
+The same reading engine as the window (tokenizing, ORP, pacing, saved
+places) drawn with curses, for SSH sessions and low-power machines. Only
+glance_engine is imported, so Tk doesn't need to be installed.
+
+Keys: space start/pause, left/right skip 10 words, [ ] previous/next
+sentence, { } previous/next paragraph, up/down change the WPM, q quits.
+--trace writes frame timing in the same format as the window's Export
+Trace, so the pacing accuracy of the two front ends can be compared.
+"""
+import argparse
+import curses
+import os
+import queue
+import sys
+
+from glance_engine import FrameTrace, PacingRules, ReadingEngine, ReadingLog, SessionStore, format_minutes, open_loader
+
+LOADER_POLL_MS = 50
+SCRUB_WORDS = 10
+WPM_STEP = 25
+MIN_WPM, MAX_WPM = 100, 2500  # Same range as the window's slider
+
+
+class TerminalReader:
+    """RSVP on a curses screen. getch() timeouts double as the word timer,
+    so the process sleeps between flashes instead of polling."""
+    def __init__(self, screen, path, wpm=None, chunk_size=None, trace=None):
+        self.screen = screen
+        self.path = os.path.abspath(path)
+        self.sessions = SessionStore()
+        saved = self.sessions.settings
+        self.engine = ReadingEngine(wpm=wpm or saved.get("wpm", 350),
+                                    chunk_size=chunk_size or saved.get("chunk_size", 1),
+                                    rules=PacingRules.load())  # ~/.glance/pacing.json, as in the window
+        self.clock = self.engine.scheduler.clock
+        self.reading_log = ReadingLog(enabled=saved.get("reading_log", False))
+        self.trace = trace
+        self.digest = self.sessions.digest_for(self.path)
+        self.resume = self.sessions.document(self.digest)  # Saved place, until enough words are in
+        self.loader = open_loader(self.path, self.digest)
+        self.progress = 0.0
+        self.running = False
+        self.starved = False
+        self.due = 0.0  # Clock time the next flash is due while running
+        self.shown = None  # Index of the flash on screen
+        self.message = "Loading..."
+
+        self.highlight = self.accent = curses.A_BOLD
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            curses.init_pair(1, curses.COLOR_RED, -1)
+            curses.init_pair(2, curses.COLOR_BLUE, -1)
+            self.highlight = curses.color_pair(1) | curses.A_BOLD
+            self.accent = curses.color_pair(2)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass  # Terminal can't hide the cursor
+
+    # -------------------------------------------------------------------------
+    #  Loop
+    # -------------------------------------------------------------------------
+    def run(self):
+        self.loader.start()
+        self.draw()
+        try:
+            while True:
+                timeout = -1
+                if self.running:
+                    timeout = max(0, int(self.due - self.clock.now()))
+                if self.loader is not None:
+                    timeout = LOADER_POLL_MS if timeout < 0 else min(timeout, LOADER_POLL_MS)
+                self.screen.timeout(timeout)
+                key = self.screen.getch()
+                if key != -1:
+                    if not self.on_key(key): break
+                    continue
+                if self.loader is not None:
+                    self.poll_loader()
+                if self.running and self.clock.now() >= self.due:
+                    self.tick()
+        finally:
+            if self.loader is not None:
+                self.loader.cancel()
+            if self.running:
+                self.reading_log.stop("close", self.engine.index, self.engine.scheduler)
+            self.save()
+        return self
+
+    def tick(self):
+        engine = self.engine
+        if engine.at_end() and self.loader is not None:
+            # Caught up with the background loader: wait for the next chunk
+            self.starved = True
+            self.due = self.clock.now() + LOADER_POLL_MS
+            return
+        if self.starved:
+            self.starved = False
+            engine.scheduler.resync()
+
+        fired = self.clock.now()
+        index = engine.next_word()
+        if index is None:
+            self.running = False
+            self.reading_log.stop("end", engine.index, engine.scheduler)
+            self.shown = None
+            self.message = f"Completed | {engine.scheduler.summary()}"
+            self.draw()
+            return
+        self.shown = index
+        t0 = self.clock.now()
+        self.draw()
+        if self.trace is not None:
+            t1 = self.clock.now()
+            self.trace.record(index, engine.scheduler.deadline, fired, t1, t1 - t0, 0.0)
+        engine.advance()
+        self.due = engine.scheduler.deadline
+
+    def poll_loader(self):
+        store = self.engine.store
+        state = None
+        try:
+            while True:
+                kind, payload, self.progress = self.loader.queue.get_nowait()
+                if kind != "chunk":
+                    state = (kind, payload)
+                    break
+                store.append(payload)
+        except queue.Empty:
+            if not self.loader.is_alive() and self.loader.queue.empty():
+                state = ("error", "The loader stopped unexpectedly")
+
+        if state is None:
+            self.try_resume()
+        else:
+            self.loader = None
+            if state[0] == "error":
+                self.message = f"Could not read file: {state[1]}"
+            else:
+                if self.digest is None and state[1]:
+                    # First open: now that the hash is known, look for a saved place
+                    self.digest = state[1]
+                    if not self.running and self.engine.index == 0:
+                        self.resume = self.sessions.document(state[1])
+                self.message = None
+                self.try_resume(final=True)
+        if not self.running:
+            self.draw()
+
+    def try_resume(self, final=False):
+        doc = self.resume
+        if doc is None or self.running: return
+        index = doc.get("index", 0)
+        if index >= len(self.engine.store) and not final: return
+        self.resume = None
+        if self.engine.store:
+            self.shown = self.engine.seek(index)
+
+    def save(self):
+        self.reading_log.flush(wait=True)
+        if not self.digest or self.resume is not None: return
+        engine = self.engine
+        self.sessions.remember_file(self.path, self.digest)
+        self.sessions.update_document(self.digest, index=engine.index, path=self.path,
+                                      wpm=engine.wpm, chunk_size=engine.chunk_size)
+        self.sessions.flush(wait=True)
+
+    # -------------------------------------------------------------------------
+    #  Keys
+    # -------------------------------------------------------------------------
+    def on_key(self, key):
+        """Handles one key press; False to quit"""
+        engine = self.engine
+        if key in (ord("q"), ord("Q")):
+            return False
+        if key == ord(" "):
+            self.toggle()
+        elif key in (curses.KEY_UP, curses.KEY_DOWN):
+            step = WPM_STEP if key == curses.KEY_UP else -WPM_STEP
+            engine.wpm = max(MIN_WPM, min(MAX_WPM, engine.wpm + step))
+            self.reading_log.wpm(engine.wpm)
+        elif engine.store and key in self.MOVES:
+            before = engine.index
+            self.MOVES[key](engine)
+            self.reading_log.seek(before, engine.index)
+            self.resume = None  # Moving by hand supersedes the saved place
+            if not self.running:
+                self.shown = engine.index
+        elif key != curses.KEY_RESIZE:
+            return True
+        self.draw()
+        return True
+
+    MOVES = {
+        curses.KEY_LEFT: lambda engine: engine.step(-SCRUB_WORDS),
+        curses.KEY_RIGHT: lambda engine: engine.step(SCRUB_WORDS),
+        ord("["): lambda engine: engine.seek_sentence(-1),
+        ord("]"): lambda engine: engine.seek_sentence(1),
+        ord("{"): lambda engine: engine.seek_paragraph(-1),
+        ord("}"): lambda engine: engine.seek_paragraph(1),
+    }
+
+    def toggle(self):
+        if self.running:
+            self.running = False
+            self.message = f"Paused | {self.engine.scheduler.summary()}"
+            self.reading_log.stop("pause", self.engine.index, self.engine.scheduler)
+            self.save()
+        elif self.engine.store:
+            self.resume = None  # Reading from here supersedes the saved spot
+            self.message = None
+            self.running = True
+            self.engine.start(rewind=self.loader is None)  # Only a finished document restarts from the top
+            self.reading_log.start(self.digest, self.path, self.engine.index,
+                                   self.engine.wpm, self.engine.chunk_size)
+            self.due = self.clock.now()
+
+    # -------------------------------------------------------------------------
+    #  Drawing
+    # -------------------------------------------------------------------------
+    def _put(self, y, x, text, attr=0):
+        # Writing into the bottom-right cell raises even though it draws
+        try:
+            self.screen.addstr(y, x, text, attr)
+        except curses.error:
+            pass
+
+    def draw(self):
+        screen = self.screen
+        screen.erase()
+        h, w = screen.getmaxyx()
+        cy, cx = (h - 2) // 2, w // 2
+
+        # Guide notches above and below the focus letter
+        for y in (cy - 2, cy + 2):
+            if 0 <= y < h - 2:
+                self._put(y, cx, "|", self.accent)
+
+        if self.shown is not None and self.shown < len(self.engine.store):
+            _, text, orp = self.engine.chunk(self.shown)
+            x = cx - orp
+            cut = max(0, -x)  # Clip a word wider than the terminal on the left
+            self._put(cy, max(0, x), text[cut:cut + w - max(0, x) - 1], curses.A_BOLD)
+            if 0 <= orp < len(text):
+                self._put(cy, cx, text[orp], self.highlight)
+        elif self.message and self.message.startswith("Completed"):
+            self._put(cy, max(0, cx - 4), "COMPLETED", self.highlight)
+
+        self._draw_status(h, w)
+        screen.refresh()
+
+    def _draw_status(self, h, w):
+        engine = self.engine
+        count = len(engine.store)
+        filled = int((w - 1) * engine.index / count) if count else 0
+        self._put(h - 2, 0, "=" * filled, self.accent)
+
+        parts = [f"{engine.index}/{count}",
+                 f"Remaining: {format_minutes(engine.remaining_minutes())}",
+                 f"{engine.wpm} WPM"]
+        if self.loader is not None:
+            parts.append(f"Loading {100 * self.progress:.0f}%")
+        if self.message:
+            parts.append(self.message)
+        elif not self.running:
+            parts.append("Space to read, q to quit")
+        self._put(h - 1, 0, " | ".join(parts)[:w - 1])
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Glance speed reader for the terminal")
+    parser.add_argument("file", help="text file, EPUB or PDF to read")
+    parser.add_argument("--wpm", type=int, help="words per minute (default: last used)")
+    parser.add_argument("--chunk", type=int, choices=range(1, 5), help="words per flash (default: last used)")
+    parser.add_argument("--trace", metavar="PATH", help="record frame timing, written to PATH (.csv or .json) on exit")
+    args = parser.parse_args(argv)
+    if not os.path.isfile(args.file):
+        parser.error(f"no such file: {args.file}")
+    if args.wpm is not None and not MIN_WPM <= args.wpm <= MAX_WPM:
+        parser.error(f"--wpm must be between {MIN_WPM} and {MAX_WPM}")
+
+    trace = FrameTrace() if args.trace else None
+    reader = curses.wrapper(lambda screen: TerminalReader(screen, args.file, args.wpm, args.chunk, trace).run())
+
+    print(reader.engine.scheduler.summary())
+    if trace is not None:
+        stats = trace.summary(last=len(trace))
+        if stats:
+            print(f"jitter {stats['jitter_ms']:.1f} ms | p95 late {stats['p95_late_ms']:.1f} ms | "
+                  f"effective {stats['effective_wpm']:.0f} WPM | draw {stats['draw_ms']:.2f} ms")
+        trace.export(args.trace)
+        print(f"Frame timing written to {args.trace}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())